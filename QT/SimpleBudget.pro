@@ -26,7 +26,13 @@ FORMS    += \
     manageRecord.ui \
     budgetReport.ui \
     balanceReport.ui \
-    selectMonth.ui
+    selectMonth.ui \
+    searchTransactions.ui \
+    transactionsLedger.ui \
+    budgetMatrix.ui \
+    categoryTrends.ui \
+    balanceHistory.ui \
+    calendarHeatmap.ui
 
 RESOURCES += \
     iconset.qrc
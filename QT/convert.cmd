@@ -8,5 +8,11 @@
 ::CALL pyuic5 -o manageRecord.py manageRecord.ui
 ::CALL pyuic5 -o budgetReport.py budgetReport.ui
 ::CALL pyuic5 -o balanceReport.py balanceReport.ui
-CALL pyuic5 -o selectMonth.py selectMonth.ui
+::CALL pyuic5 -o selectMonth.py selectMonth.ui
+::CALL pyuic5 -o searchTransactions.py searchTransactions.ui
+::CALL pyuic5 -o transactionsLedger.py transactionsLedger.ui
+::CALL pyuic5 -o budgetMatrix.py budgetMatrix.ui
+::CALL pyuic5 -o categoryTrends.py categoryTrends.ui
+::CALL pyuic5 -o balanceHistory.py balanceHistory.ui
+CALL pyuic5 -o calendarHeatmap.py calendarHeatmap.ui
 pause
\ No newline at end of file
@@ -3,8 +3,8 @@ from PyQt5.QtCore import QItemSelectionModel, Qt, QModelIndex
 
 import ui.manageAccounts
 from models import ListModel
-from enums import ACCOUNT_TYPES
-from utils import show_warning
+from core.enums import ACCOUNT_TYPES
+from ui.helpers import show_warning
 
 
 class AccountsManager(ui.manageAccounts.Ui_Dialog, QDialog):
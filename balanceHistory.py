@@ -0,0 +1,63 @@
+from PyQt5.Qt import QDialog, Qt
+import time
+
+from ui.balanceHistory import Ui_Dialog
+from ui.QLineChart import QLineChart
+from core import analytics
+
+ALL_ACCOUNTS = 'All budget accounts'
+# Colors of account lines, the combined balance is black
+COLORS = (Qt.darkBlue, Qt.darkGreen, Qt.darkRed, Qt.darkMagenta,
+          Qt.darkCyan, Qt.darkYellow)
+
+
+class BalanceHistory(Ui_Dialog, QDialog):
+    """
+    GUI that charts daily balance of an account or of all budget accounts.
+    """
+    def __init__(self, orm):
+        super().__init__()
+        self.setupUi(self)
+
+        self.orm = orm
+        self.accounts = self.orm.fetch_accounts_summary()
+
+        self.accountBox.addItem(ALL_ACCOUNTS)
+        self.accountBox.addItems([acc.name for acc in self.accounts])
+
+        self.chart = QLineChart()
+        self.chartLayout.addWidget(self.chart)
+        self.load_chart()
+
+        # Connect signals and slots
+        self.accountBox.currentIndexChanged.connect(
+            lambda index: self.load_chart())
+        self.accountsBox.toggled.connect(lambda checked: self.load_chart())
+
+    def load_chart(self):
+        """
+        Puts the balance of chosen account into the chart. The combined
+        balance can be drawn along with the balance of each account.
+        """
+        start = time.perf_counter()
+
+        index = self.accountBox.currentIndex()
+        self.accountsBox.setEnabled(index == 0)
+        if index == 0:
+            series = analytics.balance_series(self.orm)
+            lines = [(series.days, series.values, Qt.black)]
+            if self.accountsBox.isChecked():
+                for i, account in enumerate(self.accounts):
+                    account_series = analytics.balance_series(self.orm,
+                                                              account.id)
+                    lines.append((account_series.days, account_series.values,
+                                  COLORS[i % len(COLORS)]))
+        else:
+            account = self.accounts[index - 1]
+            series = analytics.balance_series(self.orm, account.id)
+            lines = [(series.days, series.values, COLORS[0])]
+        self.chart.setLines(lines)
+
+        elapsed = (time.perf_counter() - start) * 1000
+        self.infoLabel.setText("{} days, loaded in {:.0f} ms".format(
+            len(series.days), elapsed))
@@ -0,0 +1,191 @@
+"""
+Generates a realistic SimpleBudget file of any size for benchmarks.
+The same seed and sizes always give the same file.
+
+Usage: python -m benchmarks.generate FILE [--preset small|medium|huge]
+           [--accounts N] [--parents N] [--subcategories N] [--years N]
+           [--per-day N] [--till-year YYYY] [--seed N]
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+from calendar import monthrange
+
+from core import ORM
+from core.enums import ACCOUNT_TYPES, BUDGET_TYPES
+
+# Sizes of generated files: accounts, parent categories, subcategories of
+# each parent, years and transactions per day
+PRESETS = {
+    'small': dict(accounts=3, parents=4, subcategories=4, years=2,
+                  per_day=5),
+    'medium': dict(accounts=8, parents=8, subcategories=6, years=5,
+                   per_day=50),
+    'huge': dict(accounts=20, parents=12, subcategories=8, years=10,
+                 per_day=500),
+    # Two accounts of about 100k transactions each
+    'account': dict(accounts=2, parents=8, subcategories=6, years=5,
+                    per_day=110),
+}
+
+WORDS = ('grocery', 'market', 'coffee', 'lunch', 'dinner', 'taxi', 'bus',
+         'fuel', 'rent', 'power', 'water', 'phone', 'internet', 'book',
+         'cinema', 'gift', 'doctor', 'pharmacy', 'gym', 'shoes', 'shirt',
+         'salary', 'bonus', 'refund', 'interest', 'insurance', 'repair',
+         'travel', 'hotel', 'ticket', 'school', 'toys', 'pet', 'garden')
+# Rows passed to executemany at once
+CHUNK = 10000
+
+
+def _chunks(rows, size=CHUNK):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _days(first_year, last_year):
+    day = datetime.date(first_year, 1, 1)
+    last_day = datetime.date(last_year, 12, 31)
+    while day <= last_day:
+        yield day
+        day += datetime.timedelta(days=1)
+
+
+def generate(path, accounts, parents, subcategories, years, per_day,
+             till_year=None, seed=0):
+    """
+    Creates the file with given sizes, returns the number of rows by table.
+    The first parent category is income, the others are spending.
+    """
+    if os.path.exists(path):
+        raise FileExistsError(path)
+    rand = random.Random(seed)
+    till_year = till_year or datetime.date.today().year
+    first_year = till_year - years + 1
+
+    orm = ORM(path)
+    db_conn = orm.storage.db_conn
+
+    # Accounts, every fifth is out of budget and every seventh is closed
+    db_conn.executemany(
+        "INSERT INTO Accounts VALUES(?, ?, 0, ?, ?)",
+        (('Account {}'.format(i + 1), ACCOUNT_TYPES[i % len(ACCOUNT_TYPES)],
+          int(i % 7 == 6), int(i % 5 == 4)) for i in range(accounts)))
+
+    # Categories
+    parent_names = ['Income'] + ['Spending {}'.format(i)
+                                 for i in range(1, parents)]
+    db_conn.executemany("INSERT INTO Categories VALUES(?)",
+                        ((name, ) for name in parent_names))
+    db_conn.executemany(
+        "INSERT INTO Subcategories VALUES(?, ?)",
+        (('{} {}'.format(parent, i + 1), parent)
+         for parent in parent_names for i in range(subcategories)))
+    category_ids = [rowid for rowid, in db_conn.execute(
+        "SELECT rowid FROM Subcategories ORDER BY rowid")]
+    income_ids = category_ids[:subcategories]
+    spending_ids = category_ids[subcategories:] or income_ids
+
+    # Transactions, spending most days and income twice a month
+    def transactions():
+        for day in _days(first_year, till_year):
+            for _ in range(per_day):
+                yield (str(day), -rand.randint(100, 20000),
+                       ' '.join(rand.sample(WORDS, 3)),
+                       rand.randint(1, accounts), rand.choice(spending_ids))
+            if day.day in (1, 15):
+                yield (str(day), rand.randint(100000, 500000),
+                       'salary ' + rand.choice(WORDS), 1,
+                       rand.choice(income_ids))
+
+    # Revision and search index triggers are dropped for the bulk insert,
+    # search index is rebuilt once and triggers are restored after it
+    triggers = db_conn.execute("""
+    SELECT name, sql FROM sqlite_master
+    WHERE type = 'trigger' AND tbl_name = 'Transactions'""").fetchall()
+    for name, _ in triggers:
+        db_conn.execute("DROP TRIGGER {}".format(name))
+    for chunk in _chunks(transactions()):
+        db_conn.executemany("INSERT INTO Transactions VALUES(?, ?, ?, ?, ?)",
+                            chunk)
+    db_conn.execute(
+        "INSERT INTO TransactionsSearch(TransactionsSearch) VALUES ('rebuild')")
+    db_conn.execute("UPDATE Revision SET version = version + 1")
+    for _, sql in triggers:
+        db_conn.execute(sql)
+
+    # Budget records of every type for each category and month
+    def records():
+        for year in range(first_year, till_year + 1):
+            for month in range(1, 13):
+                _, last_day = monthrange(year, month)
+                for i, category_id in enumerate(category_ids):
+                    budget_type = BUDGET_TYPES[i % len(BUDGET_TYPES)]
+                    if budget_type == 'Point':
+                        day = rand.randint(1, last_day)
+                    elif budget_type == 'Weekly':
+                        day = rand.randint(1, 7)
+                    else:
+                        day = 1
+                    amount = rand.randint(10000, 200000)
+                    if category_id not in income_ids:
+                        amount = -amount
+                    yield amount, category_id, budget_type, day, year, month
+
+    db_conn.executemany("INSERT INTO Budget VALUES(?, ?, ?, ?, ?, ?)",
+                        records())
+
+    db_conn.execute("""
+    UPDATE Accounts SET balance = (
+    SELECT COALESCE(SUM(amount), 0) FROM Transactions
+    WHERE acc_id = Accounts.rowid)""")
+    db_conn.commit()
+    db_conn.execute("ANALYZE")
+
+    counts = dict((table, db_conn.execute(
+        "SELECT COUNT(*) FROM {}".format(table)).fetchone()[0])
+        for table in ('Accounts', 'Subcategories', 'Transactions', 'Budget'))
+    db_conn.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('file', help='DB file to create')
+    parser.add_argument('--preset', choices=PRESETS, default='small')
+    for size in PRESETS['small']:
+        parser.add_argument('--' + size.replace('_', '-'), type=int,
+                            help='overrides the preset')
+    parser.add_argument('--till-year', type=int,
+                        help='the last year of data, current by default')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    sizes = dict(PRESETS[args.preset])
+    for size in sizes:
+        if getattr(args, size) is not None:
+            sizes[size] = getattr(args, size)
+
+    start = time.perf_counter()
+    try:
+        counts = generate(args.file, till_year=args.till_year,
+                          seed=args.seed, **sizes)
+    except FileExistsError:
+        print('File already exists: {}'.format(args.file))
+        sys.exit(1)
+    print('{} generated in {:.1f}s: {}'.format(
+        args.file, time.perf_counter() - start,
+        ', '.join('{} {}'.format(count, table)
+                  for table, count in counts.items())))
+
+
+if __name__ == '__main__':
+    main()
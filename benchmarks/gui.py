@@ -0,0 +1,255 @@
+"""
+Times dialogs on the offscreen platform: from the trigger till the event
+loop is idle, so population of models, widget churn and painting count.
+
+Usage: python -m benchmarks.gui [--presets account] [--repeat N]
+           [--output FILE] [--compare BASELINE] [--tolerance 0.2]
+           [--fixtures DIR]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import config
+from benchmarks.generate import PRESETS
+from benchmarks.hotpaths import fixture, compare, FIXTURE_YEAR, MONTH,\
+    TOLERANCE
+
+
+def settle():
+    """
+    Runs the event loop until it is idle. Zero timer fires when all events
+    queued before it are processed, including layouts and paints.
+    """
+    from PyQt5.QtCore import QEventLoop, QTimer
+
+    loop = QEventLoop()
+    QTimer.singleShot(0, loop.quit)
+    loop.exec()
+
+
+def timed(trigger):
+    """
+    Calls trigger and waits for idle event loop, returns ms.
+    """
+    start = time.perf_counter()
+    trigger()
+    settle()
+    return (time.perf_counter() - start) * 1000
+
+
+def largest_account(orm):
+    """
+    Returns the account with the most transactions.
+    """
+    acc_id, = orm.storage.db_conn.execute("""
+    SELECT acc_id FROM Transactions
+    GROUP BY acc_id ORDER BY COUNT(*) DESC LIMIT 1""").fetchone()
+    return next(a for a in orm.fetch_accounts() if a.id == acc_id)
+
+
+def close(dialog):
+    """
+    Closes the dialog the way exec() returns and waits for idle loop.
+    """
+    dialog.done(0)
+    dialog.deleteLater()
+    settle()
+
+
+# Benchmark cases, each gets main window with the file opened and returns
+# the callable giving ms of a single run. Query cache is dropped before
+# every run, so DB is queried every time like on the first use.
+
+def case_open_transactions_roll(window):
+    from transactionsRoll import TransactionsRoll
+
+    orm = window.orm
+    account = largest_account(orm)
+
+    def run():
+        orm.cache.clear()
+        dialogs = []
+
+        def open_roll():
+            dialogs.append(TransactionsRoll(orm, account))
+            dialogs[0].show()
+        elapsed = timed(open_roll)
+        close(dialogs[0])
+        return elapsed
+    return run
+
+
+def _switch_months(dialog):
+    """
+    Shows the dialog for the fixture year and returns run switching it to
+    the next month.
+    """
+    orm = dialog.orm
+    dialog.yearBox.setCurrentText(str(FIXTURE_YEAR))
+    dialog.monthBox.setCurrentIndex(MONTH)
+    dialog.show()
+    settle()
+
+    def run():
+        orm.cache.clear()
+        month = dialog.monthBox.currentIndex() % 12 + 1
+        return timed(lambda: dialog.monthBox.setCurrentIndex(month))
+    return run
+
+
+def case_budget_report_month(window):
+    from budgetReport import BudgetReport
+    return _switch_months(BudgetReport(window.orm))
+
+
+def case_balance_report_month(window):
+    from balanceReport import BalanceReport
+    return _switch_months(BalanceReport(window.orm))
+
+
+def case_main_window_after_dialog(window):
+    """
+    Adds a transaction in the roll of the largest account and closes it,
+    main window patches the balance and budget bar and repaints.
+    """
+    from transactionsRoll import TransactionsRoll
+
+    orm = window.orm
+    account = largest_account(orm)
+    category = list(orm.fetch_subcategories(full=False).values())[-1]
+
+    def run():
+        dialog = TransactionsRoll(orm, account)
+        window.menuBar.setEnabled(False)
+        dialog.show()
+        settle()
+        orm.cache.clear()
+
+        def finish():
+            dialog.transaction_created(datetime.date.today(), -1000,
+                                       'benchmark', category)
+            dialog.done(0)
+            dialog.deleteLater()
+            window.menuBar.setEnabled(True)
+        return timed(finish)
+    return run
+
+
+CASES = dict((name[len('case_'):], case) for name, case in globals().items()
+             if name.startswith('case_'))
+
+
+def run_preset(path, repeat, cases):
+    """
+    Opens the copy of the file in main window and runs the cases in it.
+    """
+    from PyQt5.QtWidgets import QApplication
+    import main
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        copy = os.path.join(work_dir, os.path.basename(path))
+        shutil.copy(path, copy)
+        window = main.MainWindow()
+        window.open_file(copy)
+        window.show()
+        settle()
+        for name in cases:
+            run = CASES[name](window)
+            # Warm up
+            run()
+            timings = [run() for _ in range(repeat)]
+            # Dialogs left by the case do not slow down the next one
+            for widget in app.topLevelWidgets():
+                if widget is not window:
+                    widget.close()
+                    widget.deleteLater()
+            settle()
+            results[name] = {
+                'min': min(timings),
+                'median': statistics.median(timings),
+                'mean': statistics.mean(timings),
+                'runs': len(timings),
+            }
+            print('{:>8} {:32} {:10.2f} ms'.format(
+                os.path.basename(path).split('-')[0], name,
+                results[name]['median']), file=sys.stderr)
+        window.close_file()
+        window.close()
+        settle()
+        app.processEvents()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--presets', nargs='+', choices=PRESETS,
+                        default=['account'])
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES),
+                        default=list(CASES))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='JSON results file, stdout by default')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='JSON results to compare against')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help='allowed slowdown of median, 0.2 is 20%%')
+    parser.add_argument('--fixtures', default=os.path.join(
+        tempfile.gettempdir(), 'simplebudget-fixtures'),
+        help='directory of generated files')
+    args = parser.parse_args()
+
+    paths = dict((preset, fixture(args.fixtures, preset))
+                 for preset in args.presets)
+
+    with tempfile.TemporaryDirectory() as app_data:
+        # Offscreen platform and isolated app data dir, they are read when
+        # Qt and main are imported
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        os.environ['APPDATA'] = app_data
+        os.makedirs(os.path.join(app_data, config.APPNAME))
+
+        results = {
+            'meta': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'qpa': os.environ['QT_QPA_PLATFORM'],
+                'date': datetime.datetime.now().isoformat(timespec='seconds'),
+                'repeat': args.repeat,
+            },
+            'results': dict(
+                (preset, run_preset(paths[preset], args.repeat, args.cases))
+                for preset in args.presets),
+        }
+
+    if args.output:
+        with open(args.output, 'w') as out_file:
+            json.dump(results, out_file, indent=1)
+    else:
+        json.dump(results, sys.stdout, indent=1)
+        print()
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline, args.tolerance)
+        for preset, name, before, after in regressions:
+            print('REGRESSION {} {}: {:.2f} ms -> {:.2f} ms ({:+.0%})'.format(
+                preset, name, before, after, after / before - 1),
+                file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print('No regressions against {}'.format(args.compare),
+              file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""
+Times ORM and Storage hot paths on generated small, medium and huge files
+and compares the results against a stored baseline.
+
+Usage: python -m benchmarks.hotpaths [--presets small medium huge]
+           [--repeat N] [--output FILE] [--compare BASELINE]
+           [--tolerance 0.2] [--fixtures DIR]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+from core import ORM, to_cents
+from benchmarks.generate import PRESETS, generate
+
+# Fixtures are generated with fixed year and seed, so results of different
+# runs and machines are comparable
+FIXTURE_YEAR = 2024
+FIXTURE_SEED = 0
+# Month of reports in the last year of fixtures
+MONTH = 6
+TOLERANCE = 0.2
+
+
+def fixture(directory, preset):
+    """
+    Returns the path of generated file of the preset, generates it once.
+    """
+    path = os.path.join(directory, '{}-{}-{}.sbdb'.format(
+        preset, FIXTURE_YEAR, FIXTURE_SEED))
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        print('Generating {} fixture...'.format(preset), file=sys.stderr)
+        generate(path + '.part', till_year=FIXTURE_YEAR, seed=FIXTURE_SEED,
+                 **PRESETS[preset])
+        os.rename(path + '.part', path)
+    return path
+
+
+# Benchmark cases, each gets ORM and returns the callable to time. Read
+# cases drop query cache before each call, so DB is queried every time.
+
+def _cold(orm, call):
+    def run():
+        orm.cache.clear()
+        call()
+    return run
+
+
+def case_fetch_transactions(orm):
+    account = orm.fetch_accounts()[0]
+    return _cold(orm, lambda: orm.fetch_transactions(account))
+
+
+def case_fetch_budget_report_bars(orm):
+    return _cold(orm, lambda: list(
+        orm.fetch_budget_report_bars(MONTH, FIXTURE_YEAR)))
+
+
+def case_fetch_budget_report_bars_year(orm):
+    return _cold(orm, lambda: list(
+        orm.fetch_budget_report_bars(0, FIXTURE_YEAR)))
+
+
+def case_fetch_budget_prediction(orm):
+    date = datetime.date(FIXTURE_YEAR, MONTH, 15)
+    return _cold(orm, lambda: list(
+        orm.fetch_budget_prediction(MONTH, FIXTURE_YEAR, date)))
+
+
+def case_fetch_balance_to_date(orm):
+    return _cold(orm, lambda: orm.fetch_balance_to_date(MONTH, FIXTURE_YEAR))
+
+
+def case_iter_balance_report(orm):
+    return _cold(orm, lambda: list(
+        orm.iter_balance_report(MONTH, FIXTURE_YEAR)))
+
+
+def case_add_transaction(orm):
+    account = orm.fetch_accounts()[0]
+    category = list(orm.fetch_subcategories(full=False).values())[-1]
+    date = datetime.date(FIXTURE_YEAR, MONTH, 15)
+    return lambda: orm.add_transaction(date, -1000, 'benchmark', account,
+                                       category)
+
+
+def case_copy_records(orm):
+    """
+    Copies budget records of a month into the next one, the way budget
+    manager does it.
+    """
+    def run():
+        orm.cache.clear()
+        for record in orm.fetch_records(MONTH, FIXTURE_YEAR):
+            category = orm.fetch_subcategory(record.category_id)
+            orm.add_record(to_cents(record.amount), category, record.type,
+                           record.day, FIXTURE_YEAR, MONTH + 1)
+    return run
+
+
+CASES = dict((name[len('case_'):], case) for name, case in globals().items()
+             if name.startswith('case_'))
+# Cases changing the file, they run on its copy
+WRITES = ('add_transaction', 'copy_records')
+
+
+def measure(run, repeat):
+    """
+    Calls run once to warm up and then repeat times, returns timings in ms.
+    """
+    run()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def run_preset(path, repeat, cases):
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        copy = os.path.join(work_dir, os.path.basename(path))
+        shutil.copy(path, copy)
+        for name in cases:
+            if name in WRITES:
+                orm = ORM(copy)
+            else:
+                orm = ORM(path, readonly=True)
+            timings = measure(CASES[name](orm), repeat)
+            results[name] = {
+                'min': min(timings),
+                'median': statistics.median(timings),
+                'mean': statistics.mean(timings),
+                'runs': len(timings),
+            }
+            orm.storage.db_conn.close()
+            print('{:>8} {:32} {:10.2f} ms'.format(
+                os.path.basename(path).split('-')[0], name,
+                results[name]['median']), file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Returns (preset, case, baseline ms, current ms) of every case whose
+    median is slower than baseline by more than tolerance.
+    """
+    regressions = []
+    for preset, cases in results['results'].items():
+        for name, result in cases.items():
+            try:
+                before = baseline['results'][preset][name]['median']
+            except KeyError:
+                continue
+            if result['median'] > before * (1 + tolerance):
+                regressions.append((preset, name, before, result['median']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--presets', nargs='+', choices=PRESETS,
+                        default=['small', 'medium'])
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES),
+                        default=list(CASES))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='JSON results file, stdout by default')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='JSON results to compare against')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help='allowed slowdown of median, 0.2 is 20%%')
+    parser.add_argument('--fixtures', default=os.path.join(
+        tempfile.gettempdir(), 'simplebudget-fixtures'),
+        help='directory of generated files')
+    args = parser.parse_args()
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'repeat': args.repeat,
+        },
+        'results': dict(
+            (preset, run_preset(fixture(args.fixtures, preset), args.repeat,
+                                args.cases))
+            for preset in args.presets),
+    }
+
+    if args.output:
+        with open(args.output, 'w') as out_file:
+            json.dump(results, out_file, indent=1)
+    else:
+        json.dump(results, sys.stdout, indent=1)
+        print()
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline, args.tolerance)
+        for preset, name, before, after in regressions:
+            print('REGRESSION {} {}: {:.2f} ms -> {:.2f} ms ({:+.0%})'.format(
+                preset, name, before, after, after / before - 1),
+                file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print('No regressions against {}'.format(args.compare),
+              file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+"""
+Measures Python memory of standard workflows on generated files with
+tracemalloc: peak while the window or dialog is open, memory retained
+after it is closed and top allocation sites. Fails when models of a closed
+dialog or their rows are still alive.
+
+Usage: python -m benchmarks.memory [--presets account] [--top N]
+           [--output FILE] [--fixtures DIR]
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import tracemalloc
+import weakref
+
+import config
+from benchmarks.generate import PRESETS
+from benchmarks.hotpaths import fixture, FIXTURE_YEAR
+from benchmarks.gui import settle, largest_account
+
+# Frames of traceback stored for each allocation
+FRAMES = 10
+TOP = 10
+# Allocations of tracemalloc itself are not reported
+IGNORED = (tracemalloc.Filter(False, tracemalloc.__file__),
+           tracemalloc.Filter(False, '<unknown>'))
+
+
+# Workflows, each gets main window and the path of file and opens a window
+# or dialog. Returns it with the callable closing it the way the app does.
+
+def workflow_open_file(window, path):
+    window.open_file(path)
+    return window, window.close_file
+
+
+def workflow_largest_account(window, path):
+    from transactionsRoll import TransactionsRoll
+
+    dialog = TransactionsRoll(window.orm, largest_account(window.orm))
+    dialog.show()
+    return dialog, lambda: dialog.done(0)
+
+
+def _whole_year(dialog):
+    dialog.yearBox.setCurrentText(str(FIXTURE_YEAR))
+    dialog.monthBox.setCurrentIndex(0)  # All
+    dialog.show()
+    return dialog, lambda: dialog.done(0)
+
+
+def workflow_balance_report_year(window, path):
+    from balanceReport import BalanceReport
+    return _whole_year(BalanceReport(window.orm))
+
+
+def workflow_budget_report_year(window, path):
+    from budgetReport import BudgetReport
+    return _whole_year(BudgetReport(window.orm))
+
+
+# Name, workflow and whether it needs the file opened in main window
+WORKFLOWS = (
+    ('open_file', workflow_open_file, False),
+    ('largest_account', workflow_largest_account, True),
+    ('balance_report_year', workflow_balance_report_year, True),
+    ('budget_report_year', workflow_budget_report_year, True),
+)
+
+
+def model_refs(owner):
+    """
+    Returns (name, weak reference) of item models held by the window or
+    dialog and of the first row of each of them.
+    """
+    from PyQt5.QtCore import QAbstractItemModel
+
+    refs = []
+    for name, value in vars(owner).items():
+        if isinstance(value, QAbstractItemModel):
+            refs.append((name, weakref.ref(value)))
+            items = getattr(value, 'items', None)
+            if items:
+                try:
+                    refs.append((name + '.items[0]', weakref.ref(items[0])))
+                except TypeError:  # Tuples can not be referenced weakly
+                    pass
+    return refs
+
+
+def _top(snapshot, before, top):
+    return ['{:>10.1f} KiB {:>+8} blocks  {}'.format(
+        stat.size_diff / 1024, stat.count_diff, stat.traceback[0])
+        for stat in snapshot.filter_traces(IGNORED).compare_to(
+            before.filter_traces(IGNORED), 'lineno')[:top]
+        if stat.size_diff > 0]
+
+
+def measure(workflow, window, path, top):
+    """
+    Runs the workflow under tracemalloc, closes the window or dialog it has
+    opened and collects garbage. Returns the report of the workflow.
+    """
+    gc.collect()
+    tracemalloc.start(FRAMES)
+    before = tracemalloc.take_snapshot()
+    base, _ = tracemalloc.get_traced_memory()
+
+    owner, close = workflow(window, path)
+    settle()
+    opened = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    refs = model_refs(owner)
+
+    close()
+    # Nothing but the models themselves refers to the closed dialog
+    del owner, close
+    settle()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    closed = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    return {
+        'peak': peak - base,
+        'retained': current - base,
+        'top': _top(opened, before, top),
+        'retained_top': _top(closed, before, top),
+        'alive': [name for name, ref in refs if ref() is not None],
+    }
+
+
+def run_preset(path, top):
+    from PyQt5.QtWidgets import QApplication
+    import main
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        copy = os.path.join(work_dir, os.path.basename(path))
+        shutil.copy(path, copy)
+        window = main.MainWindow()
+        window.show()
+        settle()
+        for name, workflow, needs_file in WORKFLOWS:
+            if needs_file and window.orm is None:
+                window.open_file(copy)
+                settle()
+            results[name] = measure(workflow, window, copy, top)
+        window.close_file()
+        window.close()
+        settle()
+        app.processEvents()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--presets', nargs='+', choices=PRESETS,
+                        default=['account'])
+    parser.add_argument('--top', type=int, default=TOP,
+                        help='allocation sites to report')
+    parser.add_argument('--output', help='JSON results file, stdout by default')
+    parser.add_argument('--fixtures', default=os.path.join(
+        tempfile.gettempdir(), 'simplebudget-fixtures'),
+        help='directory of generated files')
+    args = parser.parse_args()
+
+    paths = dict((preset, fixture(args.fixtures, preset))
+                 for preset in args.presets)
+
+    with tempfile.TemporaryDirectory() as app_data:
+        # Offscreen platform and isolated app data dir, they are read when
+        # Qt and main are imported
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        os.environ['APPDATA'] = app_data
+        os.makedirs(os.path.join(app_data, config.APPNAME))
+
+        results = {
+            'meta': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            },
+            'results': dict((preset, run_preset(paths[preset], args.top))
+                            for preset in args.presets),
+        }
+
+    leaks = []
+    for preset, workflows in results['results'].items():
+        for name, report in workflows.items():
+            print('{:>8} {:24} peak {:10.1f} KiB  retained {:10.1f} KiB'.format(
+                preset, name, report['peak'] / 1024,
+                report['retained'] / 1024), file=sys.stderr)
+            for line in report['top']:
+                print('    ' + line, file=sys.stderr)
+            leaks.extend((preset, name, alive) for alive in report['alive'])
+
+    if args.output:
+        with open(args.output, 'w') as out_file:
+            json.dump(results, out_file, indent=1)
+    else:
+        json.dump(results, sys.stdout, indent=1)
+        print()
+
+    for preset, name, alive in leaks:
+        print('LEAK {} {}: {} is alive after closing'.format(
+            preset, name, alive), file=sys.stderr)
+    if leaks:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+"""
+Counts SQL statements, their time and fetched rows of ORM calls on the
+small generated file and fails when a call runs more statements than its
+pinned budget, so N+1 query patterns are caught before they get slow. A call
+without budget and an ORM read method without call fail as well.
+
+Usage: python -m benchmarks.querybudget [--preset small] [--fixtures DIR]
+"""
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+
+from core import ORM
+from core.analytics import budget_matrix, category_trends, balance_series
+from core.instrument import measure
+from benchmarks.generate import PRESETS
+from benchmarks.hotpaths import fixture, FIXTURE_YEAR, MONTH
+
+# Maximum number of statements of every call with empty query cache.
+# Counts must not depend on the number of categories, records or
+# transactions in the file. Every public read method of ORM must have one.
+QUERY_BUDGETS = {
+    'fetch_accounts': 1,
+    'fetch_accounts_summary': 1,
+    'fetch_years': 1,
+    'fetch_parents': 1,
+    'fetch_subcategories': 1,
+    'fetch_subcategories_for_parent': 1,
+    'fetch_subcategory': 1,
+    'fetch_transactions': 2,
+    'iter_transactions': 2,
+    'fetch_transactions_for_month': 2,
+    'iter_transactions_for_month': 2,
+    'iter_transactions_for_range': 2,
+    'fetch_transactions_for_period': 2,
+    'iter_transactions_for_period': 2,
+    'search_transactions': 2,
+    'fetch_ledger_ids': 1,
+    'fetch_ledger_rows': 1,
+    'fetch_records': 2,
+    'fetch_records_year': 2,
+    'iter_records': 2,
+    'fetch_budget_for_month': 1,
+    'fetch_budgets_for_range': 1,
+    'fetch_summary_for_month': 1,
+    'fetch_summaries_for_range': 1,
+    'fetch_monthly_summaries': 1,
+    'fetch_budget_report_bars': 3,
+    'fetch_budget_report_bars_year': 3,
+    'fetch_budget_report_bar': 3,
+    'fetch_range_report_bars': 3,
+    'fetch_range_report_bar': 3,
+    'fetch_budget_prediction': 3,
+    'fetch_range_prediction': 3,
+    'fetch_balance_to_date': 2,
+    'fetch_balance_before': 2,
+    'iter_balance_report': 6,
+    'iter_range_balance_report': 6,
+    'fetch_daily_sums': 1,
+    'budget_matrix': 3,
+    'category_trends': 2,
+    'balance_series': 1,
+}
+# Prefixes of ORM read methods, each of them must be measured
+READ_PREFIXES = ('fetch_', 'iter_', 'search_')
+
+
+def calls(orm):
+    """
+    Returns the calls to measure by name. Iterators are consumed, so all
+    their statements are counted.
+    """
+    account = orm.fetch_accounts()[0]
+    category = list(orm.fetch_subcategories(full=False).values())[-1]
+    parent = orm.fetch_parents()[0]
+    date = datetime.date(FIXTURE_YEAR, MONTH, 15)
+    first_day = datetime.date(FIXTURE_YEAR, 1, 1)
+    last_day = datetime.date(FIXTURE_YEAR, 12, 31)
+    # A word of some transaction info, so the search finds rows
+    word = orm.fetch_transactions(account)[0].info.split()[0]
+    ledger_ids = orm.fetch_ledger_ids()[:200]
+    orm.cache.clear()
+    return {
+        'fetch_accounts': orm.fetch_accounts,
+        'fetch_accounts_summary': orm.fetch_accounts_summary,
+        'fetch_years': orm.fetch_years,
+        'fetch_parents': orm.fetch_parents,
+        'fetch_subcategories': orm.fetch_subcategories,
+        'fetch_subcategories_for_parent': lambda:
+            orm.fetch_subcategories_for_parent(parent),
+        'fetch_subcategory': lambda: orm.fetch_subcategory(category.id),
+        'fetch_transactions': lambda: orm.fetch_transactions(account),
+        'iter_transactions': lambda: list(orm.iter_transactions(account)),
+        'fetch_transactions_for_month': lambda:
+            orm.fetch_transactions_for_month(MONTH, FIXTURE_YEAR, category),
+        'iter_transactions_for_month': lambda: list(
+            orm.iter_transactions_for_month(MONTH, FIXTURE_YEAR, category)),
+        'iter_transactions_for_range': lambda: list(
+            orm.iter_transactions_for_range(first_day, last_day, category)),
+        'fetch_transactions_for_period': lambda:
+            orm.fetch_transactions_for_period(MONTH, FIXTURE_YEAR),
+        'iter_transactions_for_period': lambda: list(
+            orm.iter_transactions_for_period(MONTH, FIXTURE_YEAR)),
+        'search_transactions': lambda: orm.search_transactions(word),
+        'fetch_ledger_ids': orm.fetch_ledger_ids,
+        'fetch_ledger_rows': lambda: orm.fetch_ledger_rows(ledger_ids),
+        'fetch_records': lambda: orm.fetch_records(MONTH, FIXTURE_YEAR),
+        'fetch_records_year': lambda: orm.fetch_records(0, FIXTURE_YEAR),
+        'iter_records': lambda: list(orm.iter_records(MONTH, FIXTURE_YEAR)),
+        'fetch_budget_for_month': lambda:
+            orm.fetch_budget_for_month(MONTH, FIXTURE_YEAR, category),
+        'fetch_budgets_for_range': lambda:
+            orm.fetch_budgets_for_range(first_day, last_day),
+        'fetch_summary_for_month': lambda:
+            orm.fetch_summary_for_month(MONTH, FIXTURE_YEAR, category),
+        'fetch_summaries_for_range': lambda:
+            orm.fetch_summaries_for_range(first_day, last_day),
+        'fetch_monthly_summaries': lambda:
+            orm.fetch_monthly_summaries(first_day, last_day),
+        'fetch_budget_report_bars': lambda: list(
+            orm.fetch_budget_report_bars(MONTH, FIXTURE_YEAR)),
+        'fetch_budget_report_bars_year': lambda: list(
+            orm.fetch_budget_report_bars(0, FIXTURE_YEAR)),
+        'fetch_budget_report_bar': lambda:
+            orm.fetch_budget_report_bar(MONTH, FIXTURE_YEAR, category),
+        'fetch_range_report_bars': lambda: list(
+            orm.fetch_range_report_bars(first_day, last_day)),
+        'fetch_range_report_bar': lambda:
+            orm.fetch_range_report_bar(first_day, last_day, category),
+        'fetch_budget_prediction': lambda: list(
+            orm.fetch_budget_prediction(MONTH, FIXTURE_YEAR, date)),
+        'fetch_range_prediction': lambda: list(
+            orm.fetch_range_prediction(first_day, last_day, date)),
+        'fetch_balance_to_date': lambda:
+            orm.fetch_balance_to_date(MONTH, FIXTURE_YEAR),
+        'fetch_balance_before': lambda: orm.fetch_balance_before(date),
+        'iter_balance_report': lambda: list(
+            orm.iter_balance_report(MONTH, FIXTURE_YEAR)),
+        'iter_range_balance_report': lambda: list(
+            orm.iter_range_balance_report(first_day, last_day)),
+        'fetch_daily_sums': lambda: orm.fetch_daily_sums(first_day, last_day),
+        'budget_matrix': lambda: budget_matrix(orm, FIXTURE_YEAR),
+        'category_trends': lambda: category_trends(
+            orm, FIXTURE_YEAR - 1, FIXTURE_YEAR),
+        'balance_series': lambda: balance_series(orm),
+    }
+
+
+def unmeasured(orm, measured):
+    """
+    Returns the names of ORM read methods that no call measures.
+    """
+    return sorted(name for name in dir(type(orm))
+                  if name.startswith(READ_PREFIXES) and name not in measured)
+
+
+def run(path):
+    """
+    Measures every call on empty query cache, returns the list of
+    (name, Usage, budget) and the names of ORM read methods not measured.
+    Budget is None for a call without one.
+    """
+    orm = ORM(path, readonly=True)
+    results = []
+    measured = calls(orm)
+    for name, call in measured.items():
+        orm.cache.clear()
+        with measure(orm.storage) as usage:
+            call()
+        results.append((name, usage[0], QUERY_BUDGETS.get(name)))
+    missing = unmeasured(orm, measured)
+    orm.storage.db_conn.close()
+    return results, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--preset', default='small',
+                        choices=PRESETS)
+    parser.add_argument('--fixtures', default=os.path.join(
+        tempfile.gettempdir(), 'simplebudget-fixtures'),
+        help='directory of generated files')
+    args = parser.parse_args()
+
+    results, missing = run(fixture(args.fixtures, args.preset))
+    over = []
+    print('{:32} {:>10} {:>8} {:>10} {:>8}'.format(
+        'call', 'statements', 'budget', 'rows', 'ms'))
+    for name, usage, budget in results:
+        print('{:32} {:10} {:>8} {:10} {:8.2f}'.format(
+            name, usage.statements, '-' if budget is None else budget,
+            usage.rows, usage.time * 1000))
+        if budget is None or usage.statements > budget:
+            over.append((name, usage.statements, budget))
+
+    for name, statements, budget in over:
+        if budget is None:
+            print('NO BUDGET {}: {} statements'.format(name, statements),
+                  file=sys.stderr)
+        else:
+            print('OVER BUDGET {}: {} statements, budget is {}'.format(
+                name, statements, budget), file=sys.stderr)
+    for name in missing:
+        print('NOT MEASURED {}: ORM read method has no call'.format(name),
+              file=sys.stderr)
+    if over or missing:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
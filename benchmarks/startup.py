@@ -0,0 +1,108 @@
+"""
+Measures cold start of the app: the time from launching a fresh
+interpreter till the first paint of the main window with given file opened.
+
+Usage: python -m benchmarks.startup FILE [--runs N] [--target SECONDS]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import config
+from core.cache import ReportCache
+
+# Cold start to first paint we aim at, seconds
+TARGET = 1.5
+PAINTED = 'PAINTED'
+
+
+def child(db_path):
+    """
+    Starts the app and reports the first paint event to stdout.
+    """
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QObject, QEvent
+    import main
+
+    main.update_recent(db_path)
+    app = QApplication(sys.argv)
+
+    class FirstPaint(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint:
+                print(PAINTED, flush=True)
+                app.quit()
+            return False
+
+    first_paint = FirstPaint()
+    app.installEventFilter(first_paint)
+    form = main.MainWindow()
+    form.show()
+    app.exec()
+
+
+def measure(db_path, env):
+    """
+    Runs the app once, returns seconds till the first paint. The reports
+    cache saved by the previous run is removed, so every start is cold.
+    """
+    try:
+        os.remove(db_path + ReportCache.EXTENSION)
+    except FileNotFoundError:
+        pass
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.startup', '--child', db_path],
+        stdout=subprocess.PIPE, universal_newlines=True, env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    for line in process.stdout:
+        if line.strip() == PAINTED:
+            elapsed = time.perf_counter() - start
+            break
+    else:
+        raise RuntimeError("App exited without painting the window")
+    process.wait()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('file', help='DB file to open on start')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--target', type=float, default=TARGET,
+                        help='median start up time to meet, seconds')
+    parser.add_argument('--child', action='store_true',
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.file)
+        return
+
+    with tempfile.TemporaryDirectory() as app_data:
+        # Isolated app data dir, recent file points to a copy of the file
+        # under test, so the app leaves nothing next to the original
+        env = dict(os.environ, APPDATA=app_data)
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        os.makedirs(os.path.join(app_data, config.APPNAME))
+        db_path = os.path.join(app_data, os.path.basename(args.file))
+        shutil.copy(args.file, db_path)
+
+        timings = [measure(db_path, env) for _ in range(args.runs)]
+
+    median = statistics.median(timings)
+    print('runs: {}  min: {:.3f}s  median: {:.3f}s  max: {:.3f}s  '
+          'target: {:.3f}s'.format(args.runs, min(timings), median,
+                                   max(timings), args.target))
+    if median > args.target:
+        print('FAIL: start up is slower than target')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
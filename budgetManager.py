@@ -6,8 +6,9 @@ import ui.manageBudget
 from recordManager import Manager
 from monthSelector import Selector
 from models import TableModel
-from enums import YEARS, MONTHS
-from utils import show_warning, to_cents
+from core.enums import MONTHS
+from core.helpers import to_cents
+from ui.helpers import show_warning
 
 class BudgetManager(ui.manageBudget.Ui_Dialog, QDialog):
     """
@@ -21,6 +22,7 @@ class BudgetManager(ui.manageBudget.Ui_Dialog, QDialog):
 
         # Fetch subcategories list
         self.categories = self.orm.fetch_subcategories(full=False)
+        self.years = self.orm.fetch_years()
 
         self.recordsView.horizontalHeader().setSectionResizeMode(
             QHeaderView.Stretch)
@@ -43,7 +45,7 @@ class BudgetManager(ui.manageBudget.Ui_Dialog, QDialog):
         """
         Sets initial values for year and month boxes.
         """
-        self.yearBox.addItems(YEARS)
+        self.yearBox.addItems(self.years)
         self.monthBox.addItems(MONTHS[1:])
         current_date = QDate.currentDate()
         self.yearBox.setCurrentText(str(current_date.year()))
@@ -65,9 +67,7 @@ class BudgetManager(ui.manageBudget.Ui_Dialog, QDialog):
         self.records.prepare()
         month = self.monthBox.currentIndex() + 1  # by position+1
         year = self.yearBox.currentText()
-        records = self.orm.fetch_records(month, year)
-        for r in records:
-            self.records.addRow(r)
+        self.records.addRows(self.orm.iter_records(month, year))
 
     def add_record(self):
         """
@@ -77,7 +77,7 @@ class BudgetManager(ui.manageBudget.Ui_Dialog, QDialog):
             show_warning('You have to create categories first.')
             return
 
-        manager = Manager(self.categories.values())
+        manager = Manager(self.categories.values(), self.years)
         manager.createdRecord.connect(self.record_created)
         manager.exec()
 
@@ -88,7 +88,7 @@ class BudgetManager(ui.manageBudget.Ui_Dialog, QDialog):
         index = self.selection.currentIndex()
         if index.isValid():
             record = index.data(role=Qt.UserRole)
-            manager = Manager(self.categories.values(), record)
+            manager = Manager(self.categories.values(), self.years, record)
             manager.editedRecord.connect(self.record_edited)
             manager.exec()
 
@@ -103,7 +103,7 @@ class BudgetManager(ui.manageBudget.Ui_Dialog, QDialog):
             self.records.removeRows(index.row(), 1)
 
     def copy_records(self):
-        dialog = Selector()
+        dialog = Selector(self.years)
         dialog.monthSelected.connect(self.copy_from_month)
         dialog.exec()
 
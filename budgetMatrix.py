@@ -0,0 +1,44 @@
+from PyQt5.Qt import QDialog, QDate
+from ui.budgetMatrix import Ui_Dialog
+from models import MatrixModel
+from core.enums import MONTHS
+from core import analytics
+
+KINDS = ('Variance', 'Budget', 'Actual')
+
+
+class BudgetMatrix(Ui_Dialog, QDialog):
+    """
+    GUI that shows budget, actual sums or their difference for every
+    category and month of the year with totals.
+    """
+    def __init__(self, orm):
+        super().__init__()
+        self.setupUi(self)
+
+        self.orm = orm
+
+        self.yearBox.addItems(self.orm.fetch_years())
+        self.yearBox.setCurrentText(str(QDate.currentDate().year()))
+        self.kindBox.addItems(KINDS)
+
+        self.matrix = MatrixModel((), MONTHS[1:] + ('Total', ))
+        self.matrixView.setModel(self.matrix)
+        self.load_matrix()
+
+        # Connect signals and slots
+        self.yearBox.currentTextChanged.connect(
+            lambda year: self.load_matrix())
+        self.kindBox.currentTextChanged.connect(
+            lambda kind: self.load_matrix())
+
+    def load_matrix(self):
+        """
+        Puts the matrix of chosen kind for chosen year into the view.
+        """
+        year = int(self.yearBox.currentText())
+        report = analytics.budget_matrix(self.orm, year)
+        values = getattr(report, self.kindBox.currentText().lower())
+        row_headers = [c.parent + '::' + c.name for c in report.categories]
+        self.matrix.setMatrix(row_headers + ['Total'],
+                              analytics.with_totals(values))
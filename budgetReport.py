@@ -1,24 +1,18 @@
-from PyQt5.Qt import QDialog, QDate, QLabel
+from PyQt5.Qt import QDialog, QLabel
 from ui.budgetReport import Ui_Dialog
 from ui.QBar import QBar
+from ui.helpers import PeriodSelector
 from models import TableModel
-from enums import YEARS, MONTHS
 
 
-class BudgetReport(Ui_Dialog, QDialog):
+class BudgetReport(PeriodSelector, Ui_Dialog, QDialog):
     def __init__(self, orm):
         super().__init__()
         self.setupUi(self)
 
         self.orm = orm
 
-        self.set_month_and_year()
-
-        # Connect signals and slots
-        self.yearBox.currentTextChanged.connect(
-            lambda year: self.load_budget_bars())
-        self.monthBox.currentTextChanged.connect(
-            lambda month: self.load_budget_bars())
+        self.setup_period(self.orm.fetch_years(), self.load_budget_bars)
 
         # Show report for current month as initial
         self.load_budget_bars()
@@ -27,27 +21,16 @@ class BudgetReport(Ui_Dialog, QDialog):
         self.transactions = TableModel(("Date", "Amount", "Info", "Category"))
         self.transactionsView.setModel(self.transactions)
 
-    def set_month_and_year(self):
-        """
-        Sets initial values for year and month boxes.
-        """
-        self.yearBox.addItems(YEARS)
-        self.monthBox.addItems(MONTHS)
-        current_date = QDate.currentDate()
-        self.yearBox.setCurrentText(str(current_date.year()))
-        self.monthBox.setCurrentText(MONTHS[current_date.month()])
-
     def load_budget_bars(self):
         """
-        Loads the budget report from DB for chosen month and year and puts
-        it into GUI.
+        Loads the budget report from DB for chosen period and puts it into
+        GUI.
         """
         self.clear_bars()
 
-        year = int(self.yearBox.currentText())
-        month = int(self.monthBox.currentIndex())  # by position
-
-        for budget_bar in self.orm.fetch_budget_report_bars(month, year):
+        from_date, till_date = self.period()
+        for budget_bar in self.orm.fetch_range_report_bars(from_date,
+                                                           till_date):
             self.add_bar(budget_bar)
 
         self.barsLayout.setColumnStretch(1, 1)
@@ -81,10 +64,8 @@ class BudgetReport(Ui_Dialog, QDialog):
         """
         self.transactions.prepare()
 
-        year = int(self.yearBox.currentText())
-        month = int(self.monthBox.currentIndex())  # by position
+        from_date, till_date = self.period()
         category = q_bar.model.category
 
-        for transaction in self.orm.fetch_transactions_for_month(month, year,
-                                                                 category):
-            self.transactions.addRow(transaction)
+        self.transactions.addRows(self.orm.iter_transactions_for_range(
+            from_date, till_date, category))
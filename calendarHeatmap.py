@@ -0,0 +1,72 @@
+from PyQt5.Qt import QDialog, QDate
+import datetime
+
+from ui.calendarHeatmap import Ui_Dialog
+from ui.QHeatmap import QHeatmap
+
+ALL_CATEGORIES = 'All categories'
+ALL_ACCOUNTS = 'All budget accounts'
+
+
+class CalendarHeatmap(Ui_Dialog, QDialog):
+    """
+    GUI that shows net sum of every day of the year in a calendar, so the
+    days of heavy spending stand out.
+    """
+    def __init__(self, orm):
+        super().__init__()
+        self.setupUi(self)
+
+        self.orm = orm
+
+        self.yearBox.addItems(self.orm.fetch_years())
+        self.yearBox.setCurrentText(str(QDate.currentDate().year()))
+        self.fill_filters()
+
+        self.heatmap = QHeatmap()
+        self.heatmapLayout.addWidget(self.heatmap)
+        self.heatmap.daySelected.connect(self.show_day)
+        self.load_heatmap()
+
+        # Connect signals and slots
+        self.yearBox.currentTextChanged.connect(
+            lambda year: self.load_heatmap())
+        self.categoryBox.currentIndexChanged.connect(
+            lambda index: self.load_heatmap())
+        self.accountBox.currentIndexChanged.connect(
+            lambda index: self.load_heatmap())
+
+    def fill_filters(self):
+        """
+        Fills category and account boxes, item data is the id to filter by.
+        """
+        self.categoryBox.addItem(ALL_CATEGORIES, None)
+        for category in sorted(self.orm.fetch_subcategories().values(),
+                               key=lambda c: (c.parent, c.name)):
+            self.categoryBox.addItem(category.parent + '::' + category.name,
+                                     category.id)
+        self.accountBox.addItem(ALL_ACCOUNTS, None)
+        for account in self.orm.fetch_accounts():
+            self.accountBox.addItem(account.name, account.id)
+
+    def load_heatmap(self):
+        """
+        Puts the sums of days of chosen year into the calendar and shows
+        the heaviest day.
+        """
+        year = int(self.yearBox.currentText())
+        sums = self.orm.fetch_daily_sums(
+            datetime.date(year, 1, 1), datetime.date(year, 12, 31),
+            self.categoryBox.currentData(), self.accountBox.currentData())
+        self.heatmap.setSums(year, sums)
+
+        if sums and min(sums.values()) < 0:
+            day = min(sums, key=sums.get)
+            self.infoLabel.setText("Heaviest day: {} spent {:.2f}".format(
+                day, -sums[day]))
+        else:
+            self.infoLabel.setText("No spending")
+
+    def show_day(self, day):
+        self.infoLabel.setText("{}: {:.2f}".format(
+            day, self.heatmap.sums.get(day, 0)))
@@ -2,7 +2,7 @@ from PyQt5.QtWidgets import QDialog
 from PyQt5.Qt import Qt
 from models import TreeModel, TreeItem
 import ui.manageCategories
-from utils import show_warning
+from ui.helpers import show_warning
 
 
 class CategoriesManager(ui.manageCategories.Ui_Dialog, QDialog):
@@ -0,0 +1,66 @@
+from PyQt5.Qt import QDialog, QDate
+from ui.categoryTrends import Ui_Dialog
+from models import MatrixModel
+from core import analytics
+
+GROUPS = ('Category', 'Parent category')
+KINDS = ('Sum', 'Moving average', 'Year over year')
+# Years shown when dialog opens
+DEFAULT_YEARS = 5
+
+
+class CategoryTrends(Ui_Dialog, QDialog):
+    """
+    GUI that shows monthly sums of categories over years, their moving
+    averages and changes against the year before.
+    """
+    def __init__(self, orm):
+        super().__init__()
+        self.setupUi(self)
+
+        self.orm = orm
+
+        years = self.orm.fetch_years()
+        current_year = QDate.currentDate().year()
+        self.fromYearBox.addItems(years)
+        self.tillYearBox.addItems(years)
+        self.fromYearBox.setCurrentText(
+            str(max(current_year - DEFAULT_YEARS + 1, int(years[0]))))
+        self.tillYearBox.setCurrentText(str(current_year))
+        self.groupBox.addItems(GROUPS)
+        self.kindBox.addItems(KINDS)
+
+        self.trends = MatrixModel((), ())
+        self.trendsView.setModel(self.trends)
+        self.load_trends()
+
+        # Connect signals and slots
+        for box in (self.fromYearBox, self.tillYearBox, self.groupBox,
+                    self.kindBox):
+            box.currentTextChanged.connect(lambda text: self.load_trends())
+        self.windowBox.valueChanged.connect(lambda value: self.load_trends())
+
+    def load_trends(self):
+        """
+        Puts chosen kind of trends into the view. Monthly sums are cached,
+        averages and changes are computed over them on the fly.
+        """
+        from_year = int(self.fromYearBox.currentText())
+        till_year = max(from_year, int(self.tillYearBox.currentText()))
+        by_parent = self.groupBox.currentIndex() == 1
+        trends = analytics.category_trends(self.orm, from_year, till_year,
+                                           by_parent)
+
+        kind = self.kindBox.currentText()
+        if kind == 'Moving average':
+            values = analytics.moving_average(trends.values,
+                                              self.windowBox.value())
+        elif kind == 'Year over year':
+            values = analytics.year_over_year(trends.values)
+        else:
+            values = trends.values
+        self.windowBox.setEnabled(kind == 'Moving average')
+
+        headers = ['{}-{:02}'.format(year, month)
+                   for year, month in trends.months]
+        self.trends.setMatrix(trends.labels, values, headers)
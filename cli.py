@@ -0,0 +1,200 @@
+"""
+Command line interface to SimpleBudget files, works without GUI.
+
+    python cli.py report FILE... --period 2024 2024-01:2024-06 --output DIR
+    python cli.py export FILE transactions --format jsonl --output out.gz
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import json
+import os
+import re
+import sys
+
+from core import ORM
+from core import export as exporters
+
+REPORTS = ('budget', 'balance')
+FORMATS = ('csv', 'json', 'jsonl')
+EXPORTS = ('transactions', 'records', 'balance')
+HEADERS = {
+    'budget': ('Parent', 'Category', 'Fact', 'Budget', 'Expectation'),
+    'balance': ('Date', 'Change', 'Total', 'Origin', 'Category'),
+}
+
+# ORM of each file opened read only by the worker process
+_orms = {}
+
+
+def parse_periods(specs):
+    """
+    Turns period specs into (month, year) pairs, month 0 is full year.
+    Spec is YYYY, YYYY-MM or YYYY-MM:YYYY-MM range of months.
+    """
+    periods = []
+    for spec in specs:
+        match = re.fullmatch(r'(\d{4})(?:-(\d{1,2}))?(?::(\d{4})-(\d{1,2}))?',
+                             spec)
+        if match is None:
+            raise argparse.ArgumentTypeError(
+                "Bad period '{}', use YYYY, YYYY-MM or YYYY-MM:YYYY-MM"
+                .format(spec))
+        year, month, last_year, last_month = match.groups()
+        if month is None:
+            periods.append((0, int(year)))
+        elif last_year is None:
+            periods.append((int(month), int(year)))
+        else:
+            y, m = int(year), int(month)
+            while (y, m) <= (int(last_year), int(last_month)):
+                periods.append((m, y))
+                y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+    return periods
+
+
+def _period_name(month, year):
+    return str(year) if month == 0 else '{}-{:02}'.format(year, month)
+
+
+def _get_orm(db_path):
+    """
+    Returns read only ORM of the file for current worker process.
+    """
+    if db_path not in _orms:
+        _orms[db_path] = ORM(db_path, readonly=True)
+    return _orms[db_path]
+
+
+def _report_rows(orm, kind, month, year):
+    if kind == 'budget':
+        for bar in orm.fetch_budget_report_bars(month, year):
+            yield (bar.category.parent, bar.category.name, bar.value,
+                   bar.maximum, bar.expectation)
+    else:
+        yield from orm.iter_balance_report(month, year)
+
+
+def _write(rows, headers, out_path, out_format):
+    """
+    Writes rows to file, returns the number of rows written.
+    """
+    with open(out_path, 'w', newline='') as out_file:
+        if out_format == 'json':
+            items = [dict(zip(headers, row)) for row in rows]
+            json.dump(items, out_file, default=str, indent=1)
+            return len(items)
+        return exporters.write_rows(rows, headers, out_file, out_format)
+
+
+def make_report(db_path, kind, month, year, out_dir, out_format):
+    """
+    Builds single report and writes it into output dir. Runs in worker.
+    """
+    orm = _get_orm(db_path)
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    out_path = os.path.join(out_dir, '{}-{}-{}.{}'.format(
+        stem, kind, _period_name(month, year), out_format))
+    count = _write(_report_rows(orm, kind, month, year), HEADERS[kind],
+                   out_path, out_format)
+    return out_path, count
+
+
+def report(args):
+    os.makedirs(args.output, exist_ok=True)
+    tasks = [(os.path.abspath(db_path), kind, month, year)
+             for db_path in args.files
+             for kind in args.kind
+             for month, year in args.period]
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(make_report, *task, args.output, args.format):
+                   task for task in tasks}
+        for future in as_completed(futures):
+            db_path, kind, month, year = futures[future]
+            try:
+                out_path, count = future.result()
+            except Exception as e:
+                failed += 1
+                print('FAILED {} {} {}: {}'.format(
+                    db_path, kind, _period_name(month, year), e),
+                    file=sys.stderr)
+            else:
+                print('{} ({} rows)'.format(out_path, count))
+    return 1 if failed else 0
+
+
+def export(args):
+    orm = ORM(args.file, readonly=True)
+    month = year = None
+    if args.period is not None:
+        (month, year), = args.period
+
+    if args.output == '-':
+        count = exporters.export(orm, args.what, sys.stdout, args.format,
+                                 month, year)
+    else:
+        with exporters.open_output(args.output, args.gzip) as out_file:
+            count = exporters.export(orm, args.what, out_file, args.format,
+                                     month, year)
+    print('{} rows exported'.format(count), file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='SimpleBudget batch tools.')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    report_parser = commands.add_parser(
+        'report', help='build budget and balance reports for many periods '
+                       'and files')
+    report_parser.add_argument('files', nargs='+', metavar='FILE')
+    report_parser.add_argument(
+        '--period', nargs='+', required=True,
+        help='YYYY for full year, YYYY-MM for month, YYYY-MM:YYYY-MM for '
+             'every month of the range')
+    report_parser.add_argument('--kind', nargs='+', choices=REPORTS,
+                               default=list(REPORTS))
+    report_parser.add_argument('--format', choices=FORMATS, default='csv')
+    report_parser.add_argument('--output', default='.',
+                               help='directory for report files')
+    report_parser.add_argument('--workers', type=int, default=None,
+                               help='number of worker processes')
+    report_parser.set_defaults(func=report)
+
+    export_parser = commands.add_parser(
+        'export', help='stream transactions, budget records or balance '
+                       'report into CSV or JSON Lines')
+    export_parser.add_argument('file', metavar='FILE')
+    export_parser.add_argument('what', choices=EXPORTS)
+    export_parser.add_argument(
+        '--period', help='YYYY for full year or YYYY-MM for month, '
+                         'everything by default')
+    export_parser.add_argument('--format', choices=exporters.FORMATS,
+                               default='csv')
+    export_parser.add_argument('--output', default='-',
+                               help='output file, stdout by default')
+    export_parser.add_argument('--gzip', action='store_true',
+                               help='compress output, implied by .gz suffix')
+    export_parser.set_defaults(func=export)
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == 'report':
+            args.period = parse_periods(args.period)
+        elif args.period is not None:
+            args.period = parse_periods([args.period])
+            if len(args.period) != 1:
+                raise argparse.ArgumentTypeError(
+                    "Export takes single period, YYYY or YYYY-MM")
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    if args.command == 'export' and args.what == 'balance' and\
+            args.period is None:
+        parser.error("Balance export needs --period")
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,8 @@
+"""
+Data layer of the app: Storage, ORM and models. Imports no Qt, so it can be
+used by scripts and batch jobs on a headless machine.
+"""
+from core.storage import Storage
+from core.orm import ORM, Account, Transaction, Record, Category, BudgetBar,\
+    Prediction, BalanceRow, LedgerRow
+from core.helpers import from_cents, to_cents
@@ -0,0 +1,188 @@
+"""
+Reports computed over months × categories with NumPy. Sums are read from
+DB by grouped queries, so the work depends on the number of months and
+categories, not transactions. Amounts are kept in int64 cents.
+"""
+from collections import namedtuple
+import datetime
+
+import numpy as np
+
+from core.cache import cached
+
+MONTHS_IN_YEAR = 12
+
+# Rows of arrays are categories, columns are months of the year
+BudgetMatrix = namedtuple('BudgetMatrix',
+                          ['categories', 'budget', 'actual', 'variance'])
+
+
+def _frozen(array):
+    """
+    Makes array read only, so cached arrays can be shared by callers.
+    """
+    array.flags.writeable = False
+    return array
+
+
+@cached('Budget', 'Transactions', 'Accounts', 'Subcategories')
+def budget_matrix(orm, year):
+    """
+    Builds 12 months × category matrices of budget, actual sums and
+    variance (actual - budget) in cents for the year. Only categories
+    having budget or transactions get a row.
+    """
+    budget_rows = list(orm.storage.iter_monthly_budgets(year))
+    actual_rows = list(orm.storage.iter_monthly_summaries(
+        datetime.date(year, 1, 1), datetime.date(year, 12, 31)))
+
+    subcategories = orm.fetch_subcategories()
+    ids = set(row[0] for row in budget_rows) |\
+        set(row[0] for row in actual_rows)
+    categories = sorted((subcategories[i] for i in ids if i in subcategories),
+                        key=lambda c: (c.parent, c.name))
+    positions = dict((c.id, i) for i, c in enumerate(categories))
+
+    budget = np.zeros((len(categories), MONTHS_IN_YEAR), dtype=np.int64)
+    actual = np.zeros_like(budget)
+    for category_id, month, amount in budget_rows:
+        if category_id in positions:
+            budget[positions[category_id], month - 1] = amount
+    for category_id, _, month, amount in actual_rows:
+        if category_id in positions:
+            actual[positions[category_id], month - 1] = amount
+
+    return BudgetMatrix(categories, _frozen(budget), _frozen(actual),
+                        _frozen(actual - budget))
+
+
+def with_totals(matrix):
+    """
+    Appends the column of row totals and the row of column totals.
+    """
+    rows, columns = matrix.shape
+    result = np.zeros((rows + 1, columns + 1), dtype=matrix.dtype)
+    result[:rows, :columns] = matrix
+    result[:rows, columns] = matrix.sum(axis=1)
+    result[rows, :] = result[:rows, :].sum(axis=0)
+    return result
+
+
+# Rows of values are categories or parent categories, columns are months
+Trends = namedtuple('Trends', ['labels', 'months', 'values'])
+
+
+@cached('Transactions', 'Accounts', 'Subcategories')
+def category_trends(orm, from_year, till_year, by_parent=False):
+    """
+    Builds monthly sums in cents of every category, or parent category,
+    for the years. Categories without transactions are left out.
+    """
+    months = [(year, month) for year in range(from_year, till_year + 1)
+              for month in range(1, MONTHS_IN_YEAR + 1)]
+    rows = list(orm.storage.iter_monthly_summaries(
+        datetime.date(from_year, 1, 1), datetime.date(till_year, 12, 31)))
+
+    subcategories = orm.fetch_subcategories()
+    if by_parent:
+        def label(category):
+            return category.parent or category.name
+    else:
+        def label(category):
+            return category.parent + '::' + category.name
+    labels = sorted(set(label(subcategories[row[0]]) for row in rows
+                        if row[0] in subcategories))
+    positions = dict((name, i) for i, name in enumerate(labels))
+
+    values = np.zeros((len(labels), len(months)), dtype=np.int64)
+    for category_id, year, month, amount in rows:
+        if category_id in subcategories:
+            row = positions[label(subcategories[category_id])]
+            values[row, (year - from_year) * MONTHS_IN_YEAR + month - 1] +=\
+                amount
+
+    return Trends(labels, months, _frozen(values))
+
+
+def moving_average(values, window):
+    """
+    Trailing moving average of each row over the window of columns.
+    The first columns are averaged over the columns available so far.
+    """
+    sums = np.cumsum(values, axis=1, dtype=np.float64)
+    shifted = np.zeros_like(sums)
+    shifted[:, window:] = sums[:, :-window]
+    counts = np.minimum(np.arange(1, values.shape[1] + 1), window)
+    return (sums - shifted) / counts
+
+
+def year_over_year(values):
+    """
+    Change of each monthly value against the same month a year before,
+    NaN for the first year.
+    """
+    change = np.full(values.shape, np.nan)
+    change[:, MONTHS_IN_YEAR:] =\
+        values[:, MONTHS_IN_YEAR:] - values[:, :-MONTHS_IN_YEAR]
+    return change
+
+
+# Days are numpy datetime64[D], values are cents at the end of the day
+Series = namedtuple('Series', ['days', 'values'])
+
+
+@cached('Transactions', 'Accounts')
+def balance_series(orm, acc_id=None):
+    """
+    Builds balance of the account, or of all budget accounts, for every day
+    from the first transaction till today.
+    """
+    rows = list(orm.storage.iter_daily_balances(acc_id))
+    if not rows:
+        return Series(_frozen(np.array([], dtype='datetime64[D]')),
+                      _frozen(np.array([], dtype=np.int64)))
+
+    dates = np.array([date for date, _ in rows], dtype='datetime64[D]')
+    balances = np.array([balance for _, balance in rows], dtype=np.int64)
+
+    last_day = max(dates[-1], np.datetime64(datetime.date.today(), 'D'))
+    days = np.arange(dates[0], last_day + 1)
+    # Days without transactions keep the balance of the day before
+    values = balances[np.searchsorted(dates, days, side='right') - 1]
+    return Series(_frozen(days), _frozen(values))
+
+
+def lttb(x, y, threshold):
+    """
+    Downsamples the line to threshold points by Largest-Triangle-Three-
+    Buckets: the first and the last points are kept, in every bucket
+    between them the point making the largest triangle with the previous
+    chosen point and the average of the next bucket is kept.
+    """
+    length = len(x)
+    if threshold >= length or threshold < 3:
+        return x, y
+
+    xf = x.astype(np.float64)
+    yf = y.astype(np.float64)
+    # Edges of threshold - 2 buckets between the first and the last points
+    edges = np.linspace(1, length - 1, threshold - 1).astype(np.intp)
+
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, length - 1
+    chosen = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = length - 1, length
+        avg_x = xf[next_start:next_end].mean()
+        avg_y = yf[next_start:next_end].mean()
+
+        areas = np.abs((xf[chosen] - avg_x) * (yf[start:end] - yf[chosen]) -
+                       (xf[chosen] - xf[start:end]) * (avg_y - yf[chosen]))
+        chosen = start + int(areas.argmax())
+        selected[i + 1] = chosen
+
+    return x[selected], y[selected]
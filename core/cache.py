@@ -0,0 +1,144 @@
+""" Caching of ORM query results. """
+from collections import OrderedDict
+import copy
+import functools
+import json
+import logging
+import time
+
+from core import tracing
+
+
+class QueryCache:
+    """
+    Bounded LRU cache of query results. Each entry is tagged with the
+    generations of the tables it was read from and becomes stale as soon as
+    any of those tables is written by Storage.
+    """
+    def __init__(self, storage, size=512):
+        self.storage = storage
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _generations(self, tables):
+        return tuple(self.storage.generations[t] for t in tables)
+
+    def get(self, key, tables):
+        """
+        Returns cached value for the key, raises KeyError if there is no
+        value or it is stale.
+        """
+        try:
+            generations, value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            raise
+
+        if generations != self._generations(tables):
+            # Dependent table has changed since the value was cached
+            del self.entries[key]
+            self.misses += 1
+            raise KeyError(key)
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, tables, value):
+        self.entries[key] = (self._generations(tables), value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+
+def _copy_item(item):
+    # Namedtuples, numbers and dates have no __dict__ and can't be changed,
+    # model objects like Account are edited in place by dialogs
+    if hasattr(item, '__dict__'):
+        return copy.copy(item)
+    return item
+
+
+def _copy(value):
+    """
+    Copies mutable containers and the model objects in them, so callers
+    can't alter cached value.
+    """
+    if isinstance(value, list):
+        return [_copy_item(item) for item in value]
+    if isinstance(value, dict):
+        return dict((key, _copy_item(item)) for key, item in value.items())
+    return _copy_item(value)
+
+
+def cached(*tables):
+    """
+    Caches the result of ORM read method in its QueryCache. The key is the
+    method name and its arguments, the entry depends on the given tables.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            begin = time.perf_counter()
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            try:
+                value = _copy(self.cache.get(key, tables))
+                tracing.complete(method.__qualname__, 'orm', begin,
+                                 time.perf_counter(), {'cached': True})
+                return value
+            except KeyError:
+                pass
+            except TypeError:  # unhashable arguments, can't be cached
+                with tracing.span(method.__qualname__, 'orm'):
+                    return method(self, *args, **kwargs)
+
+            value = method(self, *args, **kwargs)
+            self.cache.put(key, tables, value)
+            tracing.complete(method.__qualname__, 'orm', begin,
+                             time.perf_counter(), {'cached': False})
+            return _copy(value)
+        return wrapper
+    return decorator
+
+
+class ReportCache:
+    """
+    Sidecar file next to DB that keeps reports shown on file opening.
+    Saved reports are valid only for the same revision of DB content.
+    """
+    EXTENSION = '.cache'
+
+    def __init__(self, db_path):
+        self.path = db_path + self.EXTENSION
+
+    def load(self, revision, key):
+        """
+        Returns saved reports or None if there are none for given revision
+        and key.
+        """
+        try:
+            with open(self.path, 'r') as cache_file:
+                content = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+
+        if content.get('revision') != revision or\
+                content.get('key') != list(key):
+            return None
+        return content.get('reports')
+
+    def save(self, revision, key, reports):
+        """
+        Saves json serializable reports.
+        """
+        content = {'revision': revision, 'key': list(key), 'reports': reports}
+        try:
+            with open(self.path, 'w') as cache_file:
+                json.dump(content, cache_file)
+        except OSError as e:
+            logging.warning("Can't save report cache: %s", e)
@@ -1,7 +1,8 @@
 ACCOUNT_TYPES = ('Bank', 'Cash', 'Credit Card')
-YEARS = ('2014', '2015', '2016', '2017', '2018', '2019', '2020')
 MONTHS = ('All', 'Jan', 'Feb', 'March', 'April', 'May', 'June', 'July',
           'August', 'September', 'October', 'November', 'December')
 DAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday',
         'Sunday')
 BUDGET_TYPES = ('Monthly', 'Point', 'Daily', 'Weekly')
+PERIODS = ('Month', 'Quarter 1', 'Quarter 2', 'Quarter 3', 'Quarter 4',
+           'Last 30 days', 'Last 90 days', 'Last 365 days', 'Custom')
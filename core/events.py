@@ -0,0 +1,49 @@
+""" Change notifications sent by ORM to the views. """
+from collections import namedtuple
+
+# delta is the change of account balance, category and date tell which
+# budget figures are affected
+TransactionAdded = namedtuple('TransactionAdded',
+                              ['account', 'delta', 'category', 'date'])
+TransactionDeleted = namedtuple('TransactionDeleted',
+                                ['account', 'delta', 'category', 'date'])
+TransactionChanged = namedtuple('TransactionChanged',
+                                ['account', 'delta', 'category', 'date',
+                                 'old_category', 'old_date'])
+# Account was added, deleted or its type or status has changed
+AccountChanged = namedtuple('AccountChanged', ['account'])
+BudgetRecordChanged = namedtuple('BudgetRecordChanged',
+                                 ['category', 'year', 'month'])
+CategoryChanged = namedtuple('CategoryChanged', ['name', 'parent'])
+
+TRANSACTION_EVENTS = (TransactionAdded, TransactionDeleted, TransactionChanged)
+
+
+def affected_categories(event):
+    """
+    Returns (category, date) pairs whose budget figures are affected by the
+    transaction event.
+    """
+    pairs = [(event.category, event.date)]
+    if isinstance(event, TransactionChanged):
+        pairs.append((event.old_category, event.old_date))
+    return pairs
+
+
+class EventBus:
+    """
+    Delivers change events to subscribed callbacks in order of subscription.
+    """
+    def __init__(self):
+        self.subscribers = []
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def emit(self, event):
+        for callback in list(self.subscribers):
+            callback(event)
@@ -0,0 +1,121 @@
+"""
+Streaming export of transactions, budget records and balance report.
+Rows are written as they are read from DB cursor, so memory use does not
+depend on the number of rows.
+"""
+import csv
+import datetime
+import gzip
+import json
+
+from core.helpers import from_cents, _from_date_to_period
+
+FORMATS = ('csv', 'jsonl')
+
+TRANSACTION_HEADERS = ('Date', 'Amount', 'Info', 'Account', 'Category', 'Id')
+RECORD_HEADERS = ('Year', 'Month', 'Day', 'Type', 'Amount', 'Category', 'Id')
+BALANCE_HEADERS = ('Date', 'Change', 'Total', 'Origin', 'Category')
+
+
+def open_output(path, compress=False):
+    """
+    Opens text file for writing, gzipped if asked or path ends with .gz
+    """
+    if compress or path.endswith('.gz'):
+        return gzip.open(path, 'wt', newline='')
+    return open(path, 'w', newline='')
+
+
+def write_rows(rows, headers, out_file, out_format):
+    """
+    Writes rows one by one as CSV with header or as JSON Lines objects.
+    Returns the number of rows written.
+    """
+    count = 0
+    if out_format == 'csv':
+        writer = csv.writer(out_file)
+        writer.writerow(headers)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    elif out_format == 'jsonl':
+        for row in rows:
+            out_file.write(json.dumps(dict(zip(headers, row)), default=str))
+            out_file.write('\n')
+            count += 1
+    else:
+        raise ValueError("Unknown format: {}".format(out_format))
+    return count
+
+
+def _category_names(orm):
+    return dict((c.id, c.parent + '::' + c.name)
+                for c in orm.fetch_subcategories().values())
+
+
+def export_transactions(orm, out_file, out_format,
+                        from_date=datetime.date.min,
+                        till_date=datetime.date.max):
+    """
+    Exports transactions of all accounts, off-budget ones included, with
+    their account names for the period, all by default.
+    """
+    categories = _category_names(orm)
+    transactions = orm.storage.iter_account_transactions_for_period(
+        from_date, till_date)
+
+    def rows():
+        for date, amount, info, account, category_id, rowid in transactions:
+            yield (date, from_cents(amount), info, account,
+                   categories.get(category_id), rowid)
+
+    return write_rows(rows(), TRANSACTION_HEADERS, out_file, out_format)
+
+
+def export_records(orm, out_file, out_format, month=None, year=None):
+    """
+    Exports budget records for the period, all if year is not given.
+    Month 0 is considered full year.
+    """
+    categories = _category_names(orm)
+    if year is None:
+        records = orm.storage.iter_all_records()
+    elif month == 0:
+        records = orm.storage.iter_records_for_year(year)
+    else:
+        records = orm.storage.iter_records(month, year)
+
+    def rows():
+        for amount, category_id, budget_type, day, r_year, r_month, rowid\
+                in records:
+            yield (r_year, r_month, day, budget_type, from_cents(amount),
+                   categories.get(category_id), rowid)
+
+    return write_rows(rows(), RECORD_HEADERS, out_file, out_format)
+
+
+def export_balance(orm, out_file, out_format, month, year):
+    """
+    Exports balance report for the period.
+    """
+    return write_rows(orm.iter_balance_report(month, year), BALANCE_HEADERS,
+                      out_file, out_format)
+
+
+def export(orm, what, out_file, out_format, month=None, year=None):
+    """
+    Exports transactions, records or balance for the period. Period is
+    optional for transactions and records.
+    """
+    if what == 'transactions':
+        if year is None:
+            return export_transactions(orm, out_file, out_format)
+        f_day, l_day = _from_date_to_period(month, year)
+        return export_transactions(orm, out_file, out_format, f_day, l_day)
+    elif what == 'records':
+        return export_records(orm, out_file, out_format, month, year)
+    elif what == 'balance':
+        if year is None:
+            raise ValueError("Balance export needs a period")
+        return export_balance(orm, out_file, out_format, month, year)
+    raise ValueError("Unknown export: {}".format(what))
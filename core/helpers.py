@@ -0,0 +1,98 @@
+""" Money, date and function helpers. """
+import decimal
+import datetime
+import inspect
+from calendar import monthrange, monthcalendar
+
+
+def from_cents(cents: int):
+    """
+    Converts the int number of cents to decimal using proper math for
+    currency.
+    """
+    return decimal.Decimal(str(cents)) / decimal.Decimal('100')
+
+
+def to_cents(full: float):
+    """
+    Converts float currency into cents using proper math for currency.
+    """
+    return int(decimal.Decimal(str(full)) * decimal.Decimal('100'))
+
+
+def _from_date_to_period(month, year):
+    """
+    Converts month and year into starting and ending date of period.
+    Month 0 is considered full year.
+    """
+    if month == 0:
+        f_day = datetime.date(year, 1, 1)
+        l_day = datetime.date(year, 12, 31)
+    else:
+        _, lastday = monthrange(year, month)
+        f_day = datetime.date(year, month, 1)
+        l_day = datetime.date(year, month, lastday)
+
+    return f_day, l_day
+
+
+def _from_preset_to_period(preset, month, year, today):
+    """
+    Converts period preset of enums.PERIODS into starting and ending date.
+    Month presets use month and year, quarters use the year, rolling
+    presets end today.
+    """
+    if preset == 'Month':
+        return _from_date_to_period(month, year)
+    elif preset.startswith('Quarter'):
+        first_month = int(preset.split()[-1]) * 3 - 2
+        _, l_day = _from_date_to_period(first_month + 2, year)
+        return datetime.date(year, first_month, 1), l_day
+    elif preset.startswith('Last'):
+        days = int(preset.split()[1])
+        return today - datetime.timedelta(days=days - 1), today
+    raise ValueError("Unknown period: {}".format(preset))
+
+
+def _budget_share(amount, budget_type, day, year, month, from_date,
+                  till_date):
+    """
+    Returns the part of budget record amount falling into the period.
+    Amount is spread over the month the way it is spent: monthly and daily
+    budgets by days, weekly budget by its week days, point budget is due
+    on its day.
+    """
+    _, last_day = monthrange(year, month)
+    f_day = max(from_date, datetime.date(year, month, 1))
+    l_day = min(till_date, datetime.date(year, month, last_day))
+    if f_day > l_day:
+        return 0
+    if budget_type == 'Point':
+        return amount if f_day.day <= day <= l_day.day else 0
+    elif budget_type == 'Weekly':
+        days = [week[day - 1] for week in monthcalendar(year, month)
+                if week[day - 1] != 0]
+        covered = sum(1 for d in days if f_day.day <= d <= l_day.day)
+        return amount * covered / len(days)
+    # Monthly and Daily
+    return amount * (l_day.day - f_day.day + 1) / last_day
+
+
+def _from_str_to_date(date):
+    year, month, day = (int(i) for i in date.split('-'))
+    return datetime.date(year, month, day)
+
+
+def positional_count(func):
+    """
+    Returns the number of positional arguments func takes, None if any.
+    Wrappers of slots drop the extra arguments of signals with it.
+    """
+    count = 0
+    for param in inspect.signature(func).parameters.values():
+        if param.kind == param.VAR_POSITIONAL:
+            return None
+        if param.kind in (param.POSITIONAL_ONLY,
+                          param.POSITIONAL_OR_KEYWORD):
+            count += 1
+    return count
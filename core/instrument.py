@@ -0,0 +1,229 @@
+"""
+Counting of SQL statements, their time and fetched rows. Storage opens
+its connection with InstrumentedConnection, so every statement run by its
+cursors is accounted in the connection stats and, when slow query log is
+on, slow statements are logged with their query plans.
+"""
+from collections import namedtuple
+from contextlib import contextmanager
+import logging
+import os
+import re
+import sqlite3
+import time
+
+from core import tracing
+
+Usage = namedtuple('Usage', ['statements', 'time', 'rows'])
+
+# Slow query log is turned on by the flag or environment variable, default
+# threshold is used when no value is given, ms
+SLOW_QUERY_FLAG = '--slow-query'
+SLOW_QUERY_ENV = 'SIMPLEBUDGET_SLOW_QUERY'
+SLOW_QUERY = 100
+# String and number literals of SQL
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+class QueryStats:
+    """
+    Running totals of statements, seconds spent in SQLite and rows fetched.
+    """
+    __slots__ = ('statements', 'time', 'rows')
+
+    def __init__(self):
+        self.statements = 0
+        self.time = 0.0
+        self.rows = 0
+
+    def snapshot(self):
+        return Usage(self.statements, self.time, self.rows)
+
+    def since(self, snapshot):
+        """
+        Returns the usage since the snapshot was taken.
+        """
+        return Usage(self.statements - snapshot.statements,
+                     self.time - snapshot.time, self.rows - snapshot.rows)
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    Cursor adding its statements, their time and fetched rows to the stats
+    of its connection. Statement is finished when its rows are exhausted,
+    the next one is executed or the cursor is closed, then it is checked
+    against the slow query threshold of the connection.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # The statement in progress, its parameters and seconds spent
+        self._sql = None
+        self._parameters = None
+        self._elapsed = 0.0
+
+    def _finish(self):
+        sql, self._sql = self._sql, None
+        if sql is not None:
+            self.connection.statement_finished(sql, self._parameters,
+                                               self._elapsed)
+
+    def _executed(self, start, sql, parameters):
+        end = time.perf_counter()
+        stats = self.connection.stats
+        stats.statements += 1
+        stats.time += end - start
+        if tracing.active():
+            text = ' '.join(sql.split())
+            tracing.complete(text[:60], 'sql', start, end,
+                             {'sql': text, 'parameters': repr(parameters)})
+        self._sql, self._parameters = sql, parameters
+        self._elapsed = end - start
+        if self.description is None:  # No rows to fetch
+            self._finish()
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._executed(start, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._executed(start, sql, None)
+
+    def _fetched(self, start, rows, exhausted):
+        end = time.perf_counter()
+        stats = self.connection.stats
+        stats.time += end - start
+        stats.rows += rows
+        tracing.complete('fetch', 'sql', start, end, {'rows': rows})
+        self._elapsed += end - start
+        if exhausted:
+            self._finish()
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(start, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        start = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._fetched(start, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(start, len(rows), True)
+        return rows
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except sqlite3.Error:  # Connection is closed already
+            pass
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """
+    Connection whose cursors are instrumented, totals are in stats.
+    Statements slower than slow_query ms are logged with their query plan,
+    the plan is logged once per statement shape.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = QueryStats()
+        self.slow_query = None
+        # Shapes of statements whose plans are logged
+        self.explained = set()
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def statement_finished(self, sql, parameters, elapsed):
+        if self.slow_query is None or elapsed * 1000 < self.slow_query:
+            return
+        message = "Slow query {:.1f} ms: {}\nParameters: {!r}".format(
+            elapsed * 1000, ' '.join(sql.split()), parameters)
+        shape = _shape(sql)
+        if shape not in self.explained and parameters is not None:
+            self.explained.add(shape)
+            message += '\n' + self.explain(sql, parameters)
+        logging.warning(message)
+
+    def explain(self, sql, parameters):
+        """
+        Returns EXPLAIN QUERY PLAN of the statement as indented tree.
+        """
+        # Plain cursor, the plan is not counted or checked itself
+        db_cursor = sqlite3.Connection.cursor(self)
+        try:
+            plan = db_cursor.execute('EXPLAIN QUERY PLAN ' + sql,
+                                     parameters).fetchall()
+        except sqlite3.Error as e:
+            return 'QUERY PLAN unavailable: {}'.format(e)
+        finally:
+            db_cursor.close()
+        depths = {0: 0}
+        lines = ['QUERY PLAN']
+        for node, parent, _, detail in plan:
+            depths[node] = depths.get(parent, 0) + 1
+            lines.append('  ' * depths[node] + detail)
+        return '\n'.join(lines)
+
+
+def _shape(sql):
+    """
+    Returns the statement with literals replaced, so statements differing
+    only by inlined values have the same shape.
+    """
+    return ' '.join(_LITERALS.sub('?', sql).split())
+
+
+def slow_query_threshold(argv):
+    """
+    Returns slow query threshold in ms given by --slow-query [MS] flag or
+    SIMPLEBUDGET_SLOW_QUERY, None if the log is off.
+    """
+    value = os.environ.get(SLOW_QUERY_ENV)
+    if SLOW_QUERY_FLAG in argv:
+        position = argv.index(SLOW_QUERY_FLAG) + 1
+        value = argv[position] if position < len(argv) else ''
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return SLOW_QUERY
+
+
+@contextmanager
+def measure(storage):
+    """
+    Yields a list which gets the Usage of the block when it exits.
+
+        with measure(orm.storage) as usage:
+            orm.fetch_accounts()
+        statements, seconds, rows = usage[0]
+    """
+    stats = storage.db_conn.stats
+    start = stats.snapshot()
+    usage = []
+    try:
+        yield usage
+    finally:
+        usage.append(stats.since(start))
+
@@ -0,0 +1,63 @@
+""" Maintenance of DB file: query planner statistics, WAL and free pages. """
+
+# Writes after which maintenance runs without waiting for idle
+WRITES = 500
+# Free pages given back to the file system by a single step
+VACUUM_STEP = 256
+
+
+class Maintenance:
+    """
+    Runs maintenance of Storage in short steps, so GUI can do them between
+    events: statistics are gathered after writes, WAL is checkpointed and
+    free pages are given back to the file system. Bytes given back are
+    summed in reclaimed.
+    """
+    def __init__(self, storage, writes=WRITES, vacuum_step=VACUUM_STEP):
+        self.storage = storage
+        self.writes = writes
+        self.vacuum_step = vacuum_step
+        self.reclaimed = 0
+        # Writes count at the last statistics update, None if never updated
+        self.analyzed = self._writes() if storage.has_statistics() else None
+
+    def _writes(self):
+        return sum(self.storage.generations.values())
+
+    def _stale(self):
+        return self.analyzed is None or self._writes() > self.analyzed
+
+    def urgent(self):
+        """
+        Tells whether enough writes are made to run without waiting for idle.
+        """
+        return self.analyzed is not None and\
+            self._writes() - self.analyzed >= self.writes
+
+    def needed(self):
+        return self._stale() or self.storage.free_pages() > 0
+
+    def steps(self):
+        """
+        Runs maintenance lazily, yields the name of each step once it is done.
+        """
+        if self._stale():
+            self.storage.analyze()
+            self.analyzed = self._writes()
+            yield 'analyze'
+        while self.storage.free_pages():
+            reclaimed = self.storage.incremental_vacuum(self.vacuum_step)
+            if not reclaimed:
+                break
+            self.reclaimed += reclaimed
+            yield 'vacuum'
+        self.storage.checkpoint()
+        yield 'checkpoint'
+
+    def close(self):
+        """
+        Runs all maintenance at once before the file is closed.
+        """
+        for _ in self.steps():
+            pass
+        self.storage.optimize()
@@ -0,0 +1,691 @@
+""" Data models and ORM on top of Storage. """
+from collections import namedtuple
+import decimal
+import datetime
+import functools
+from calendar import monthrange, monthcalendar
+from core.storage import Storage
+from core.cache import QueryCache, ReportCache, cached
+from core.events import EventBus, TransactionAdded, TransactionDeleted,\
+    TransactionChanged, AccountChanged, BudgetRecordChanged, CategoryChanged
+from core.helpers import from_cents, to_cents, _from_date_to_period,\
+    _from_str_to_date, _budget_share
+
+
+class ModelCore:
+    """
+    The core of QT model. Must implement [i] and len() interface.
+    """
+    def __getitem__(self, item):
+        return getattr(self, self._attrs[item])
+
+    def __len__(self):
+        return len(self._attrs)
+
+
+class Account(ModelCore):
+    """
+    Account model class. Attributes can be changed while editing.
+    """
+    _attrs = ('name', 'balance', 'type', 'closed', 'exbudget', 'id')
+
+    def __init__(self, name, acc_type, balance, closed, exbudget, acc_id):
+        self.id = acc_id
+        self.type = acc_type
+        self.name = name
+        self.balance = from_cents(balance)
+        self.closed = closed
+        self.exbudget = exbudget
+
+
+class Transaction(ModelCore):
+    """
+    Transaction model class. Attributes can be changed while editing.
+    """
+    _attrs = ('date', 'amount', 'info', 'category', 'id', 'category_id')
+
+    def __init__(self, date, amount, info, category, trans_id, category_id):
+        self.date = date
+        self.amount = amount
+        self.info = info
+        self.category = category
+        self.id = trans_id
+        self.category_id = category_id
+
+Record = namedtuple('Record', ['amount', 'category', 'type', 'day',
+                               'year', 'month', 'id', 'category_id'])
+
+Category = namedtuple('Category', ['name', 'parent', 'id'])
+
+BudgetBar =\
+    namedtuple('BudgetBar', ['category', 'value', 'maximum', 'expectation'])
+Prediction = namedtuple('Prediction', ['date', 'amount', 'category'])
+BalanceRow = namedtuple('BalanceRow',
+                        ['date', 'change', 'total', 'origin', 'category'])
+# Transaction with the name of its account
+LedgerRow = namedtuple('LedgerRow', ['date', 'amount', 'info', 'account',
+                                     'category', 'id'])
+
+
+class ORM:
+    # Sort keys of ledger in the order of LedgerRow fields
+    LEDGER_COLUMNS = ('date', 'amount', 'info', 'account', 'category')
+
+    NO_CATEGORY = {
+        'PARENT': '',
+        'NAME': '- - -',
+        'ID': 0
+    }
+
+    def __init__(self, file_name, readonly=False, slow_query=None):
+        self.storage = Storage(file_name, readonly, slow_query)
+        self.cache = QueryCache(self.storage)
+        self.report_cache = ReportCache(file_name)
+        self.events = EventBus()
+
+    # Accounts #
+
+    @cached('Accounts')
+    def fetch_accounts_summary(self):
+        accounts = [Account(*a) for a in self.storage.select_accounts_summary()]
+        return accounts
+
+    @cached('Accounts')
+    def fetch_accounts(self):
+        accounts = [Account(*a) for a in self.storage.select_accounts()]
+        return accounts
+
+    def update_account_type(self, account, text):
+        self.storage.update_account_type(account.id, text)
+        self.events.emit(AccountChanged(account))
+
+    def update_account_status(self, account, state):
+        self.storage.update_account_status(account.id, state)
+        self.events.emit(AccountChanged(account))
+
+    def update_account_budget_status(self, account, state):
+        self.storage.update_account_budget_status(account.id, state)
+        self.events.emit(AccountChanged(account))
+
+    def add_account(self, name):
+        acc = Account(*self.storage.add_account(name))
+        self.events.emit(AccountChanged(acc))
+        return acc
+
+    def delete_account(self, account):
+        deletion = self.storage.delete_account(account.id)
+        if deletion:
+            self.events.emit(AccountChanged(account))
+        return deletion
+
+    # Periods #
+
+    @cached('Transactions', 'Budget')
+    def fetch_years(self):
+        """
+        Returns the years of transactions and budget records as strings,
+        the current and the next years are always there for planning.
+        """
+        first_date, last_date, first_year, last_year =\
+            self.storage.select_date_range()
+        this_year = datetime.date.today().year
+        years = [this_year, this_year + 1]
+        if first_date is not None:
+            years += [int(first_date[:4]), int(last_date[:4])]
+        if first_year is not None:
+            years += [int(first_year), int(last_year)]
+        return [str(year) for year in range(min(years), max(years) + 1)]
+
+    # Cached reports #
+
+    def load_start_reports(self, month, year):
+        """
+        Loads accounts summary and budget bars for the period from
+        the sidecar cache. Returns None if DB has changed since they were
+        saved.
+        """
+        reports = self.report_cache.load(self.storage.select_revision(),
+                                         (month, year))
+        if reports is None:
+            return None
+
+        accounts = [Account(*a) for a in reports['accounts']]
+        bars = [BudgetBar(Category(*category), decimal.Decimal(value),
+                          decimal.Decimal(maximum), expectation)
+                for category, value, maximum, expectation in reports['bars']]
+        return accounts, bars
+
+    def save_start_reports(self, month, year, accounts=None, bars=None):
+        """
+        Saves accounts summary and budget bars for the period into
+        the sidecar cache. They are fetched from DB unless given.
+        """
+        if accounts is None:
+            accounts = self.fetch_accounts_summary()
+        if bars is None:
+            bars = self.fetch_budget_report_bars(month, year)
+        accounts = [(a.name, a.type, to_cents(a.balance), a.closed,
+                     a.exbudget, a.id)
+                    for a in accounts]
+        bars = [(tuple(b.category), str(b.value), str(b.maximum),
+                 b.expectation)
+                for b in bars]
+        self.report_cache.save(self.storage.select_revision(), (month, year),
+                               {'accounts': accounts, 'bars': bars})
+
+    # Budget records #
+
+    def _build_record(self, query_result):
+        """
+        Builds Record object given query result and categories dictionary.
+        """
+        amount, category_id, budget_type, day, year, month, rowid = query_result
+        category = self.fetch_subcategory(category_id)
+        category_name = category.parent + '::' + category.name
+        amount = from_cents(amount)
+        return Record(amount, category_name, budget_type, day, year, month,
+                      rowid, category_id)
+
+    @cached('Budget', 'Subcategories')
+    def fetch_records(self, month, year):
+        return list(self.iter_records(month, year))
+
+    def iter_records(self, month, year):
+        """
+        Lazily builds Record objects for the given period.
+        """
+        if month == 0:
+            records = self.storage.iter_records_for_year(year)
+        else:
+            records = self.storage.iter_records(month, year)
+        return (self._build_record(r) for r in records)
+
+    @cached('Budget')
+    def fetch_budget_for_month(self, month, year, category):
+        if month == 0:
+            budget, *_ = self.storage.select_budget_for_year(year, category.id)
+        else:
+            budget, *_ = self.storage.select_budget(month, year, category.id)
+        return from_cents(budget or 0)
+
+    def delete_record(self, record):
+        self.storage.delete_record(record.id)
+        self.events.emit(BudgetRecordChanged(
+            self.fetch_subcategory(record.category_id),
+            int(record.year), int(record.month)))
+
+    def add_record(self, amount, category, budget_type, day, year, month):
+        result = self.storage.add_record(amount, category.id, budget_type,
+                                         day, year, month)
+        record = self._build_record(result)
+        self.events.emit(BudgetRecordChanged(category, int(year), int(month)))
+        return record
+
+    def update_record(self, amount, category, budget_type, day, year,
+                      month, record_id):
+        _, old_category_id, _, _, old_year, old_month, _ =\
+            self.storage.select_record(record_id)
+        self.storage.update_record(amount, category.id, budget_type, day, year,
+                                   month, record_id)
+        self.events.emit(BudgetRecordChanged(category, int(year), int(month)))
+        if (old_category_id, old_year, old_month) !=\
+                (category.id, int(year), int(month)):
+            self.events.emit(BudgetRecordChanged(
+                self.fetch_subcategory(old_category_id),
+                int(old_year), int(old_month)))
+
+    @cached('Budget')
+    def fetch_budgets_for_range(self, from_date, till_date):
+        """
+        Sums budget of every category for the period, records of months
+        covered partially are prorated. Returns dictionary by category id.
+        """
+        budgets = {}
+        records = self.storage.iter_records_for_range(
+            from_date.year, from_date.month, till_date.year, till_date.month)
+        for amount, category_id, budget_type, day, year, month, _ in records:
+            share = _budget_share(amount, budget_type, day, year, month,
+                                  from_date, till_date)
+            budgets[category_id] = budgets.get(category_id, 0) + share
+        return dict((category_id, from_cents(round(amount)))
+                    for category_id, amount in budgets.items())
+
+    def fetch_budget_report_bars(self, month, year):
+        """
+        Fetches from DB budgets and transactions for each category and turns
+        them into BudgetBar.
+        """
+        f_day, l_day = _from_date_to_period(month, year)
+        return self.fetch_range_report_bars(f_day, l_day)
+
+    def fetch_budget_report_bar(self, month, year, category):
+        """
+        Builds BudgetBar for single category, returns None if there is
+        neither budget nor transactions for the category.
+        """
+        f_day, l_day = _from_date_to_period(month, year)
+        return self.fetch_range_report_bar(f_day, l_day, category)
+
+    def fetch_range_report_bars(self, from_date, till_date):
+        """
+        Builds BudgetBar of each category for any period. Budgets and
+        transactions of all categories are summed by two grouped queries.
+        """
+        subcategories = self.fetch_subcategories()
+        for category in subcategories.values():
+            budget_bar = self.fetch_range_report_bar(from_date, till_date,
+                                                     category)
+            if budget_bar is not None:
+                yield budget_bar
+
+    def fetch_range_report_bar(self, from_date, till_date, category):
+        """
+        Builds BudgetBar of single category for any period, returns None
+        if there is neither budget nor transactions for the category.
+        """
+        zero = decimal.Decimal(0)
+        budget = self.fetch_budgets_for_range(
+            from_date, till_date).get(category.id, zero)
+        fact = self.fetch_summaries_for_range(
+            from_date, till_date).get(category.id, zero)
+
+        if budget == 0 and fact == 0:
+            return None
+        elif budget >= 0 and fact >= 0:  # Income
+            expectation = max(budget - fact, 0)
+        elif budget <= 0 and fact <= 0:  # Spending
+            expectation = min(budget - fact, 0)
+            budget = -budget
+            fact = -fact
+        else:  # budget and fact have different signs, error
+            expectation = 'Error'
+            budget = abs(budget)
+            fact = abs(fact)
+
+        return BudgetBar(category, fact, budget, str(expectation))
+
+    def fetch_budget_prediction(self, month, year, transaction_date):
+        """
+        Fetches predictions for a given period.
+
+        """
+        f_day, l_day = _from_date_to_period(month, year)
+        return self.fetch_range_prediction(f_day, l_day, transaction_date)
+
+    def fetch_range_prediction(self, from_date, till_date, transaction_date):
+        """
+        Fetches predictions after transaction date till the end of any
+        period. Records and transaction sums of all months are read by
+        single range queries.
+        """
+        min_period = min(transaction_date, from_date)
+        records = self.storage.iter_records_for_range(
+            min_period.year, min_period.month, till_date.year, till_date.month)
+        facts = self.fetch_monthly_summaries(
+            _from_date_to_period(min_period.month, min_period.year)[0],
+            _from_date_to_period(till_date.month, till_date.year)[1])
+        for record in (self._build_record(r) for r in records):
+            for prediction in self._predict(record, transaction_date, facts):
+                if prediction and prediction.date <= till_date:
+                    yield prediction
+
+    # Categories #
+
+    @cached('Categories')
+    def fetch_parents(self):
+        parents = self.storage.select_parents()
+        return [Category(*p) for p in parents]
+
+    @cached('Subcategories')
+    def fetch_subcategories_for_parent(self, category):
+        subs = self.storage.select_subcategories(category.name)
+        subs = [Category(*c) for c in subs]
+        return subs
+
+    @cached('Subcategories')
+    def fetch_subcategories(self, full=True):
+        """
+        Builds dictionary of subcategories.
+        :return: dic
+        """
+        subs = self.storage.select_all_subcategories()
+        categories = dict(((rowid, Category(name, parent, rowid))
+                          for name, parent, rowid in subs))
+
+        # Add empty category
+        if full:
+            categories[self.NO_CATEGORY['ID']] =\
+                Category(self.NO_CATEGORY['NAME'],
+                         self.NO_CATEGORY['PARENT'],
+                         self.NO_CATEGORY['ID'])
+
+        return categories
+
+    @cached('Subcategories')
+    def fetch_subcategory(self, category_id):
+        # All subcategories are fetched at once, so building of many
+        # transactions or records is a single query instead of one per
+        # category
+        category = self.fetch_subcategories().get(category_id)
+        if category is None:
+            name, parent = self.storage.select_subcategory(category_id)
+            category = Category(name, parent, category_id)
+        return category
+
+    def delete_category(self, category):
+        if category.parent is not None:
+            deletion = self.storage.delete_subcategory(category.id)
+        else:
+            deletion = self.storage.delete_category(category.name)
+        if deletion:
+            self.events.emit(CategoryChanged(category.name, category.parent))
+        return deletion
+
+    def add_category(self, name, parent):
+        if parent == '':
+            addition = self.storage.add_category(name)
+        else:
+            addition = self.storage.add_subcategory(name, parent)
+        if addition:
+            self.events.emit(CategoryChanged(name, parent))
+        return addition
+
+    # Transactions #
+
+    def _build_transaction(self, query_result):
+        """
+        Builds Transaction object given query result and categories dictionary.
+        """
+        date, amount, info, category_id, rowid = query_result
+        category = self.fetch_subcategory(category_id)
+        category_name = category.parent + '::' + category.name
+        amount = from_cents(amount)
+        date = _from_str_to_date(date)
+        return Transaction(date, amount, info, category_name,
+                           rowid, category_id)
+
+    @cached('Transactions', 'Accounts', 'Subcategories')
+    def fetch_transactions_for_month(self, month, year, category):
+        return list(self.iter_transactions_for_month(month, year, category))
+
+    def iter_transactions_for_month(self, month, year, category):
+        """
+        Lazily builds Transaction objects of the category for the period.
+        """
+        f_day, l_day = _from_date_to_period(month, year)
+        return self.iter_transactions_for_range(f_day, l_day, category)
+
+    def iter_transactions_for_range(self, from_date, till_date, category):
+        """
+        Lazily builds Transaction objects of the category for any period.
+        """
+        results = self.storage.iter_budget_transactions_for_category(
+            from_date, till_date, category.id)
+        return (self._build_transaction(t) for t in results)
+
+    @cached('Transactions', 'Accounts')
+    def fetch_summary_for_month(self, month, year, category: Category):
+        f_day, l_day = _from_date_to_period(month, year)
+
+        total, *_ = self.storage.select_summary(f_day, l_day, category.id)
+        return from_cents(total or 0)
+
+    @cached('Transactions', 'Accounts')
+    def fetch_summaries_for_range(self, from_date, till_date):
+        """
+        Sums budget transactions of every category for any period.
+        Returns dictionary by category id.
+        """
+        return dict((category_id, from_cents(total)) for category_id, total
+                    in self.storage.select_summaries(from_date, till_date))
+
+    @cached('Transactions', 'Accounts')
+    def fetch_monthly_summaries(self, from_date, till_date):
+        """
+        Sums budget transactions of every category and month of the period.
+        Returns dictionary by (year, month) of dictionaries by category id.
+        """
+        summaries = {}
+        for category_id, year, month, total in\
+                self.storage.iter_monthly_summaries(from_date, till_date):
+            summaries.setdefault((year, month), {})[category_id] =\
+                from_cents(total)
+        return summaries
+
+    @cached('Transactions', 'Accounts')
+    def fetch_daily_sums(self, from_date, till_date, category_id=None,
+                         acc_id=None):
+        """
+        Sums transactions of every day of the period, optionally of single
+        category or account. Returns dictionary by date, days without
+        transactions are missing.
+        """
+        return dict((_from_str_to_date(date), from_cents(total))
+                    for date, total in self.storage.select_daily_sums(
+                        from_date, till_date, category_id, acc_id))
+
+    def fetch_transactions_for_period(self, month, year):
+        return list(self.iter_transactions_for_period(month, year))
+
+    def iter_transactions_for_period(self, month, year):
+        """
+        Lazily builds Transaction objects for the period, rows are read
+        from DB as they are consumed.
+        """
+        f_day, l_day = _from_date_to_period(month, year)
+
+        results = self.storage.iter_transactions_for_period(f_day, l_day)
+        return (self._build_transaction(t) for t in results)
+
+    def search_transactions(self, text, limit=200):
+        """
+        Finds transactions whose info has words starting with every word
+        of the text. Best matches go first.
+        """
+        words = text.split()
+        if not words:
+            return []
+        # Every word is quoted to escape FTS syntax and searched as prefix
+        query = ' '.join('"{}"*'.format(w.replace('"', '""')) for w in words)
+        categories = self.fetch_subcategories()
+
+        results = []
+        for date, amount, info, category_id, rowid, account in\
+                self.storage.search_transactions(query, limit):
+            category = categories.get(category_id)
+            category_name = category.parent + '::' + category.name\
+                if category else ''
+            results.append(LedgerRow(
+                _from_str_to_date(date), from_cents(amount), info, account,
+                category_name, rowid))
+        return results
+
+    def fetch_ledger_ids(self, order='date', from_date=None, till_date=None,
+                         exbudget=True, closed=True):
+        """
+        Returns ids of transactions of all accounts matching the filter,
+        sorted by LEDGER_COLUMNS key in ascending order. DB sorts the rows
+        once, pages are fetched by their ids.
+        """
+        return self.storage.select_ledger_ids(order, from_date, till_date,
+                                              exbudget, closed)
+
+    def fetch_ledger_rows(self, ids):
+        """
+        Fetches transactions of all accounts by ids in the order of ids.
+        Transactions deleted since the ids were read are skipped.
+        """
+        no_category = self.NO_CATEGORY['PARENT'] + '::' +\
+            self.NO_CATEGORY['NAME']
+        rows = dict((rowid, LedgerRow(
+            _from_str_to_date(date), from_cents(amount), info, account,
+            parent + '::' + name if name is not None else no_category, rowid))
+            for date, amount, info, account, parent, name, rowid
+            in self.storage.select_ledger_rows(ids))
+        return [rows[rowid] for rowid in ids if rowid in rows]
+
+    def fetch_transactions(self, account):
+        return list(self.iter_transactions(account))
+
+    def iter_transactions(self, account):
+        """
+        Lazily builds Transaction objects for the account, rows are read
+        from DB as they are consumed.
+        """
+        results = self.storage.iter_transactions(account.id)
+        return (self._build_transaction(t) for t in results)
+
+    def fetch_balance_to_date(self, month, year):
+        f_day, _ = _from_date_to_period(month, year)
+        return self.fetch_balance_before(f_day)
+
+    def fetch_balance_before(self, from_date):
+        """
+        Returns the starting date of report and the balance before it.
+        The date is moved back to the day after the last transaction.
+        """
+        # Today is a part of the key, the value of empty roll depends on it
+        return self._fetch_balance_before(from_date, datetime.date.today())
+
+    @cached('Transactions', 'Accounts')
+    def _fetch_balance_before(self, from_date, today):
+        # Get the last transaction date
+        last_transaction, *_ = self.storage.select_last_date()
+        # Fix if transaction roll is empty
+        last_transaction = last_transaction or str(today)
+
+        last_transaction = _from_str_to_date(last_transaction)
+        last_transaction += datetime.timedelta(days=1)
+
+        last_day = min(from_date, last_transaction)
+
+        balance, *_ = self.storage.select_balance_till(last_day)
+        return last_day, from_cents(balance or 0)
+
+    def iter_balance_report(self, month, year):
+        f_day, l_day = _from_date_to_period(month, year)
+        return self.iter_range_balance_report(f_day, l_day)
+
+    def iter_range_balance_report(self, from_date, till_date):
+        """
+        Yields rows of balance report for the period: starting balance,
+        transactions of the period and budget predictions after the last
+        activity date.
+        """
+        last_date, balance = self.fetch_balance_before(from_date)
+        yield BalanceRow(last_date, 0, balance, 'Transaction', "- - -")
+
+        transactions = self.storage.iter_transactions_for_period(from_date,
+                                                                 till_date)
+        for transaction in (self._build_transaction(t) for t in transactions):
+            balance += transaction.amount
+            last_date = max(last_date, transaction.date)
+            yield BalanceRow(transaction.date, transaction.amount, balance,
+                             'Transaction', transaction.category)
+
+        # Correct the last activity date
+        last_date = max(last_date, datetime.date.today())
+
+        # Get budget spendings/incoms after active period
+        predictions = sorted(
+            self.fetch_range_prediction(from_date, till_date, last_date),
+            key=lambda p: p.date)
+        for prediction in predictions:
+            category = prediction.category
+            balance += prediction.amount
+            yield BalanceRow(prediction.date, prediction.amount, balance,
+                             'Budget', category.parent + "::" + category.name)
+
+    def delete_transaction(self, transaction, account):
+        self.storage.delete_transaction(transaction.id, account.id)
+        self.events.emit(TransactionDeleted(
+            account, -transaction.amount,
+            self.fetch_subcategory(transaction.category_id), transaction.date))
+
+    def add_transaction(self, date, amount, info, account, category):
+        tr = self.storage.add_transaction(
+            date, amount, info, account.id, category.id)
+        transaction = self._build_transaction(tr)
+        self.events.emit(TransactionAdded(
+            account, transaction.amount, category, transaction.date))
+        return transaction
+
+    def update_transaction(self, transaction, account, category):
+        old_date, old_amount, _, old_category_id =\
+            self.storage.select_transaction(transaction.id)
+        self.storage.update_transaction(
+            transaction.id, account.id, transaction.date, transaction.amount,
+            transaction.info, category.id)
+        self.events.emit(TransactionChanged(
+            account, from_cents(transaction.amount) - from_cents(old_amount),
+            category, transaction.date,
+            self.fetch_subcategory(old_category_id),
+            _from_str_to_date(old_date)))
+
+    # Predictors
+
+    def _predict(self, record: Record, transaction_date, facts):
+        """
+        :param facts: sums of transactions by (year, month) and category id
+        """
+        funcs = {
+            'Monthly': functools.partial(self._monthly_predictor, facts=facts),
+            'Point': self._point_predictor,
+            'Daily': self._daily_predictor,
+            'Weekly':  self._weekly_predictor
+        }
+
+        return funcs[record.type](record, transaction_date)
+
+    def _monthly_predictor(self, record, transaction_date, facts):
+        category = self.fetch_subcategory(record.category_id)
+        _, lastday = monthrange(record.year, record.month)
+        last_day = datetime.date(record.year, record.month, lastday)
+        budget = record.amount
+        fact = facts.get((record.year, record.month), {}).get(category.id, 0)
+
+        if budget == 0 or transaction_date >= last_day:
+            yield None
+        else:
+            if budget > 0 and fact >= 0:  # Income
+                expectation = max(budget - fact, 0)
+            elif budget < 0 and fact <= 0:  # Spending
+                expectation = min(budget - fact, 0)
+            else:  # budget and fact have different signs, error
+                # Stick to the plan
+                expectation = budget
+            yield Prediction(last_day, expectation, category)
+
+    def _point_predictor(self, record, transaction_date):
+        category = self.fetch_subcategory(record.category_id)
+        budget_date = datetime.date(record.year, record.month, record.day)
+        if transaction_date >= budget_date:
+            # Budget record has expired
+            yield None
+        else:
+            yield Prediction(budget_date, record.amount, category)
+
+    def _daily_predictor(self, record, transaction_date):
+        category = self.fetch_subcategory(record.category_id)
+        _, last_day = monthrange(record.year, record.month)
+        budget = record.amount / last_day
+        for i in range(1, last_day+1):
+            budget_date = datetime.date(record.year, record.month, i)
+            if transaction_date >= budget_date:
+                yield None
+            else:
+                yield Prediction(budget_date, budget, category)
+
+    def _weekly_predictor(self, record, transaction_date):
+        category = self.fetch_subcategory(record.category_id)
+        day = record.day - 1  # Natural day of week order to array index
+        # Calculate the dates of budget spending
+        budget_days = [datetime.date(record.year, record.month, week[day])
+                       for week in monthcalendar(record.year, record.month)
+                       if week[day] != 0]
+        budget = record.amount / len(budget_days)
+        for day in budget_days:
+            if transaction_date >= day:
+                yield None
+            else:
+                yield Prediction(day, budget, category)
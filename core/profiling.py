@@ -0,0 +1,88 @@
+"""
+Opt-in profiling of GUI actions. Profiled methods run under cProfile, each
+call dumps .prof file and top functions summary into the directory and
+logs its wall time at INFO.
+"""
+import cProfile
+import datetime
+import functools
+import io
+import itertools
+import logging
+import os
+import pstats
+import time
+
+from core.helpers import positional_count
+
+# Environment variable turning profiling on, the same as --profile flag
+ENV = 'SIMPLEBUDGET_PROFILE'
+FLAG = '--profile'
+# Functions in the summary
+TOP = 25
+
+# Profilers of the calls in progress, the innermost is the last
+_active = []
+_counter = itertools.count(1)
+
+
+def requested(argv):
+    return FLAG in argv or bool(os.environ.get(ENV))
+
+
+def _dump(profiler, directory, name, elapsed, top):
+    stem = os.path.join(directory, 'profile-{:%Y%m%d-%H%M%S}-{:04}-{}'.format(
+        datetime.datetime.now(), next(_counter), name))
+    profiler.dump_stats(stem + '.prof')
+
+    summary = io.StringIO()
+    summary.write('{} took {:.1f} ms\n'.format(name, elapsed))
+    pstats.Stats(profiler, stream=summary).sort_stats(
+        'cumulative').print_stats(top)
+    with open(stem + '.txt', 'w') as summary_file:
+        summary_file.write(summary.getvalue())
+
+
+def profiled(func, directory, top=TOP):
+    """
+    Wraps func in cProfile. Qt passes all arguments of the signal to
+    the slot, the extra ones are dropped the way PyQt does for func itself.
+    Nested profiled calls pause the profiler of the outer call, so each call
+    gets its own file.
+    """
+    positional = positional_count(func)
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if positional is not None:
+            args = args[:positional]
+        profiler = cProfile.Profile()
+        if _active:
+            _active[-1].disable()
+        _active.append(profiler)
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            elapsed = (time.perf_counter() - start) * 1000
+            _active.pop()
+            logging.info("%s took %.1f ms", name, elapsed)
+            try:
+                _dump(profiler, directory, name, elapsed, top)
+            except OSError as e:
+                logging.warning("Can't save profile of %s: %s", name, e)
+            if _active:
+                _active[-1].enable()
+    return wrapper
+
+
+def profile_methods(cls, names, directory, top=TOP):
+    """
+    Replaces methods of the class by their profiled versions, signals
+    connected after it call the profiled methods.
+    """
+    for name in names:
+        setattr(cls, name, profiled(getattr(cls, name), directory, top))
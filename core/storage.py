@@ -0,0 +1,902 @@
+from array import array
+import sqlite3
+from urllib.request import pathname2url
+from core.enums import ACCOUNT_TYPES
+from core.instrument import InstrumentedConnection
+
+# Number of rows fetched from the cursor at once by iter_* methods
+ARRAY_SIZE = 500
+
+TABLES = ('Accounts', 'Transactions', 'Categories', 'Subcategories', 'Budget')
+
+# Content revision is bumped by triggers on any change of data
+_REVISION_TRIGGERS = ''.join("""
+CREATE TRIGGER IF NOT EXISTS {0}_{1}_revision
+AFTER {1} ON {0}
+BEGIN
+UPDATE Revision SET version = version + 1;
+END;
+""".format(table, action)
+    for table in TABLES for action in ('INSERT', 'UPDATE', 'DELETE'))
+
+# Schema changes, the index of migration is the schema version it upgrades
+# from. Files created before versioning have version 0 and existing tables,
+# so the first migration must be idempotent.
+MIGRATIONS = (
+    """
+    CREATE TABLE IF NOT EXISTS Accounts(
+    name TEXT,
+    type TEXT,
+    balance INTEGER,
+    closed INTEGER,
+    exbudget INTEGER);
+
+    CREATE TABLE IF NOT EXISTS Transactions(
+    date DATE,
+    amount INTEGER,
+    info TEXT,
+    acc_id INTEGER,
+    category_id INTEGER);
+
+    CREATE TABLE IF NOT EXISTS Categories(
+    name TEXT UNIQUE);
+
+    CREATE TABLE IF NOT EXISTS Subcategories(
+    name TEXT,
+    parent TEXT,
+    UNIQUE(name, parent));
+
+    CREATE TABLE IF NOT EXISTS Budget(
+    amount INTEGER,
+    category_id INTEGER,
+    type TEXT,
+    day INTEGER,
+    year INTEGER,
+    month INTEGER);
+
+    CREATE TABLE IF NOT EXISTS Revision(
+    version INTEGER);
+
+    INSERT INTO Revision
+    SELECT 0 WHERE NOT EXISTS (SELECT * FROM Revision);
+    """ + _REVISION_TRIGGERS,
+    # Full text index of transaction info, kept in sync by triggers
+    """
+    CREATE VIRTUAL TABLE TransactionsSearch USING fts5(
+    info,
+    content='Transactions',
+    content_rowid='rowid');
+
+    CREATE TRIGGER Transactions_search_insert
+    AFTER INSERT ON Transactions
+    BEGIN
+    INSERT INTO TransactionsSearch(rowid, info)
+    VALUES (new.rowid, new.info);
+    END;
+
+    CREATE TRIGGER Transactions_search_delete
+    AFTER DELETE ON Transactions
+    BEGIN
+    INSERT INTO TransactionsSearch(TransactionsSearch, rowid, info)
+    VALUES ('delete', old.rowid, old.info);
+    END;
+
+    CREATE TRIGGER Transactions_search_update
+    AFTER UPDATE OF info ON Transactions
+    BEGIN
+    INSERT INTO TransactionsSearch(TransactionsSearch, rowid, info)
+    VALUES ('delete', old.rowid, old.info);
+    INSERT INTO TransactionsSearch(rowid, info)
+    VALUES (new.rowid, new.info);
+    END;
+
+    INSERT INTO TransactionsSearch(TransactionsSearch) VALUES ('rebuild');
+    """,
+    # Indexes for range, ledger and per account queries
+    """
+    CREATE INDEX Transactions_date ON Transactions(date);
+    CREATE INDEX Transactions_account_date ON Transactions(acc_id, date);
+    CREATE INDEX Transactions_category_date ON Transactions(category_id, date);
+    CREATE INDEX Budget_period ON Budget(year, month);
+    """,
+)
+
+SCHEMA_VERSION = len(MIGRATIONS)
+# Free pages of new files can be given back to the file system by
+# incremental vacuum. Existing files keep their mode: it could only be
+# changed by VACUUM, which may renumber rowids that Transactions refer to.
+NEW_FILE_PRAGMAS = "PRAGMA auto_vacuum = INCREMENTAL;"
+# Value of PRAGMA auto_vacuum in incremental mode
+INCREMENTAL_VACUUM = 2
+# Rows of each index read by ANALYZE, statistics are approximate but cheap
+ANALYSIS_LIMIT = 1000
+
+# Columns of ledger query by sort key
+LEDGER_ORDER = {
+    'date': ('t.date', ),
+    'amount': ('t.amount', ),
+    'info': ('t.info', ),
+    'account': ('a.name', ),
+    'category': ('s.parent', 's.name'),
+}
+
+
+def _iterate(db_cursor, size=ARRAY_SIZE):
+    """
+    Yields rows of executed cursor, fetching them in chunks of given size.
+    """
+    while True:
+        rows = db_cursor.fetchmany(size)
+        if not rows:
+            break
+        yield from rows
+
+
+class Storage:
+    def __init__(self, db_path, readonly=False, slow_query=None):
+        self.db_path = db_path
+        # Statements, their time and fetched rows are counted in
+        # db_conn.stats, statements slower than slow_query ms are logged
+        if readonly:
+            self.db_conn = sqlite3.connect(
+                'file:{}?mode=ro'.format(pathname2url(db_path)), uri=True,
+                factory=InstrumentedConnection)
+        else:
+            self.db_conn = sqlite3.connect(db_path,
+                                           factory=InstrumentedConnection)
+        self.db_conn.slow_query = slow_query
+        # Generation of each table, bumped by every write to the table
+        self.generations = dict.fromkeys(TABLES, 0)
+
+        # Bring the schema up to date, current file costs single read
+        self.db_cursor = self.db_conn.cursor()
+        self.db_cursor.execute("PRAGMA user_version")
+        version, *_ = self.db_cursor.fetchone()
+        if version < SCHEMA_VERSION and not readonly:
+            self._migrate(version)
+
+    def _migrate(self, version):
+        """
+        Applies migrations from given schema version to the current one
+        in a single transaction.
+        """
+        script = ''.join(MIGRATIONS[version:])
+        if self._pragma('page_count') == 0:
+            # Pragmas of file layout apply only before the first table
+            script = NEW_FILE_PRAGMAS + script
+        try:
+            self.db_conn.executescript(
+                "BEGIN;" + script +
+                "PRAGMA user_version = {};".format(SCHEMA_VERSION) +
+                "COMMIT;")
+        except sqlite3.Error as e:
+            # The script stops at the failed statement, inside transaction
+            if self.db_conn.in_transaction:
+                self.db_conn.rollback()
+            raise sqlite3.DatabaseError(
+                "Can't migrate {} from schema version {} to {}: {}".format(
+                    self.db_path, version, SCHEMA_VERSION, e)) from e
+
+    def _pragma(self, name):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("PRAGMA {}".format(name))
+        return db_cursor.fetchone()[0]
+
+    def _touch(self, table):
+        """
+        Marks the table as changed, so results read from it become stale.
+        """
+        self.generations[table] += 1
+
+    def select_revision(self):
+        """
+        Returns the revision of DB content, it changes with every write.
+        """
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT version FROM Revision""")
+        return db_cursor.fetchone()[0]
+
+    # #################### Accounts ########################
+
+    def select_accounts_summary(self):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT *, rowid
+        FROM Accounts
+        WHERE closed = 0""")
+        return db_cursor.fetchall()
+
+    def select_accounts(self):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT *, rowid
+        FROM Accounts""")
+        return db_cursor.fetchall()
+
+    def update_account_type(self, acc_id, value):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        UPDATE Accounts
+        SET type=?
+        WHERE rowid=?
+        """, (value, acc_id))
+        self.db_conn.commit()
+        self._touch('Accounts')
+
+    def update_account_status(self, acc_id, value):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        UPDATE Accounts
+        SET closed=?
+        WHERE rowid=?
+        """, (value, acc_id))
+        self.db_conn.commit()
+        self._touch('Accounts')
+
+    def update_account_budget_status(self, acc_id, value):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        UPDATE Accounts
+        SET exbudget=?
+        WHERE rowid=?
+        """, (value, acc_id))
+        self.db_conn.commit()
+        self._touch('Accounts')
+
+    def add_account(self, acc_name):
+        acc = (acc_name, ACCOUNT_TYPES[0], 0, 0, 0)
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        INSERT INTO Accounts
+        VALUES(?, ?, ?, ?, ?)
+        """, acc)
+        self.db_conn.commit()
+        self._touch('Accounts')
+        rowid = db_cursor.lastrowid
+        return acc + (rowid, )
+
+    def delete_account(self, acc_id):
+        # Cant delete if there is a transaction on account
+        if self.exists_transaction(acc_id):
+            return False
+
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        DELETE FROM Accounts
+        WHERE rowid=?
+        """, (acc_id, ))
+        self.db_conn.commit()
+        self._touch('Accounts')
+        return True
+
+    def update_total(self, acc_id):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT SUM(amount)
+        FROM Transactions
+        WHERE acc_id=?
+        """, (acc_id, ))
+        total, *_ = db_cursor.fetchone()
+        if total is None:
+            total = 0
+
+        db_cursor.execute("""
+        UPDATE Accounts
+        SET balance=?
+        WHERE rowid=?
+        """, (total, acc_id))
+        self.db_conn.commit()
+        self._touch('Accounts')
+
+    # ################### Transactions #####################
+
+    def select_transactions(self, acc_id):
+        return list(self.iter_transactions(acc_id))
+
+    def iter_transactions(self, acc_id):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT date, amount, info, category_id, rowid
+        FROM Transactions
+        WHERE acc_id = ?
+        ORDER BY date ASC""", (acc_id,))
+        return _iterate(db_cursor)
+
+    def select_balance_till(self, to_date):
+        """
+        Returns the balance of all accounts combined, excluding non-budget
+        accounts, up to given date.
+        """
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT sum(t.amount) FROM Transactions as t
+        INNER JOIN Accounts as a
+        on t.acc_id = a.rowid
+        WHERE date < ?
+        AND exbudget = 0""", (to_date, ))
+        return db_cursor.fetchone()
+
+    def select_summary(self, from_date, to_date, category_id):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT sum(t.amount) FROM Transactions as t
+        INNER JOIN Accounts as a
+        on t.acc_id = a.rowid
+        WHERE date BETWEEN ? AND ?
+        AND category_id=?
+        AND exbudget = 0""", (from_date, to_date, category_id))
+        return db_cursor.fetchone()
+
+    def select_summaries(self, from_date, to_date):
+        """
+        Returns (category_id, sum) of budget transactions for the period,
+        single pass over the date index for all categories.
+        """
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT t.category_id, sum(t.amount) FROM Transactions as t
+        INNER JOIN Accounts as a
+        on t.acc_id = a.rowid
+        WHERE date BETWEEN ? AND ?
+        AND exbudget = 0
+        GROUP BY t.category_id""", (from_date, to_date))
+        return db_cursor.fetchall()
+
+    def iter_monthly_summaries(self, from_date, to_date):
+        """
+        Yields (category_id, year, month, sum) of budget transactions for
+        every month of the period.
+        """
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT t.category_id,
+        CAST(substr(t.date, 1, 4) AS INTEGER) as year,
+        CAST(substr(t.date, 6, 2) AS INTEGER) as month,
+        sum(t.amount)
+        FROM Transactions as t
+        INNER JOIN Accounts as a
+        on t.acc_id = a.rowid
+        WHERE date BETWEEN ? AND ?
+        AND exbudget = 0
+        GROUP BY t.category_id, year, month""", (from_date, to_date))
+        return _iterate(db_cursor)
+
+    def iter_daily_balances(self, acc_id=None):
+        """
+        Yields (date, balance) at the end of every day having transactions
+        of the account, or of all budget accounts. Balance is running sum
+        of daily sums computed by window function.
+        """
+        db_cursor = self.db_conn.cursor()
+        if acc_id is None:
+            db_cursor.execute("""
+            SELECT t.date, SUM(SUM(t.amount)) OVER (ORDER BY t.date)
+            FROM Transactions as t
+            INNER JOIN Accounts as a
+            on t.acc_id = a.rowid
+            WHERE a.exbudget = 0
+            GROUP BY t.date
+            ORDER BY t.date""")
+        else:
+            db_cursor.execute("""
+            SELECT date, SUM(SUM(amount)) OVER (ORDER BY date)
+            FROM Transactions
+            WHERE acc_id = ?
+            GROUP BY date
+            ORDER BY date""", (acc_id, ))
+        return _iterate(db_cursor)
+
+    def select_daily_sums(self, from_date, to_date, category_id=None,
+                          acc_id=None):
+        """
+        Returns (date, sum) for every day of the period having transactions
+        of the category, if given, on the account or on all budget accounts.
+        """
+        conditions, params = ['t.date BETWEEN ? AND ?'], [from_date, to_date]
+        if category_id is not None:
+            conditions.append('t.category_id = ?')
+            params.append(category_id)
+        if acc_id is not None:
+            conditions.append('t.acc_id = ?')
+            params.append(acc_id)
+        else:
+            conditions.append('a.exbudget = 0')
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT t.date, SUM(t.amount) FROM Transactions as t
+        INNER JOIN Accounts as a
+        on t.acc_id = a.rowid
+        WHERE {}
+        GROUP BY t.date""".format(' AND '.join(conditions)), params)
+        return db_cursor.fetchall()
+
+    def select_budget_transactions_for_category(
+            self, from_date, till_date, category_id):
+        return list(self.iter_budget_transactions_for_category(
+            from_date, till_date, category_id))
+
+    def iter_budget_transactions_for_category(
+            self, from_date, till_date, category_id):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT t.date, t.amount, t.info, t.category_id, t.rowid
+        FROM Transactions as t
+        INNER JOIN Accounts as a
+        on t.acc_id = a.rowid
+        WHERE date BETWEEN ? AND ?
+        AND category_id=?
+        AND exbudget = 0""", (from_date, till_date, category_id))
+        return _iterate(db_cursor)
+
+    def select_transactions_for_period(self, from_date, till_date):
+        return list(self.iter_transactions_for_period(from_date, till_date))
+
+    def iter_transactions_for_period(self, from_date, till_date):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT t.date, t.amount, t.info, t.category_id, t.rowid
+        FROM Transactions as t
+        INNER JOIN Accounts as a
+        on t.acc_id = a.rowid
+        WHERE date BETWEEN ? AND ?
+        AND exbudget = 0""", (from_date, till_date))
+        return _iterate(db_cursor)
+
+    def iter_account_transactions_for_period(self, from_date, till_date):
+        """
+        Yields transactions of all accounts, off-budget ones included, with
+        the name of their account, in the order of date.
+        """
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT t.date, t.amount, t.info, a.name, t.category_id, t.rowid
+        FROM Transactions as t
+        LEFT JOIN Accounts as a
+        on t.acc_id = a.rowid
+        WHERE t.date BETWEEN ? AND ?
+        ORDER BY t.date, t.rowid""", (from_date, till_date))
+        return _iterate(db_cursor)
+
+    def select_last_date(self):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT MAX(date) FROM Transactions
+        """, ())
+        return db_cursor.fetchone()
+
+    def select_date_range(self):
+        """
+        Returns the first and the last dates of transactions and the first
+        and the last years of budget records. Each bound is a separate
+        subquery, so SQLite takes it from the index instead of a scan.
+        """
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT (SELECT MIN(date) FROM Transactions),
+        (SELECT MAX(date) FROM Transactions),
+        (SELECT MIN(year) FROM Budget),
+        (SELECT MAX(year) FROM Budget)""")
+        return db_cursor.fetchone()
+
+    def select_transaction(self, trans_id):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT date, amount, info, category_id
+        FROM Transactions
+        WHERE rowid = ?""", (trans_id,))
+        return db_cursor.fetchone()
+
+    def search_transactions(self, query, limit):
+        """
+        Full text search of transactions info across all accounts, best
+        matches first. Query is in FTS5 syntax.
+        """
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT t.date, t.amount, t.info, t.category_id, t.rowid, a.name
+        FROM TransactionsSearch as s
+        INNER JOIN Transactions as t
+        on t.rowid = s.rowid
+        INNER JOIN Accounts as a
+        on t.acc_id = a.rowid
+        WHERE TransactionsSearch MATCH ?
+        ORDER BY s.rank
+        LIMIT ?""", (query, limit))
+        return db_cursor.fetchall()
+
+    @staticmethod
+    def _ledger_conditions(from_date, till_date, exbudget, closed):
+        """
+        Builds WHERE clause and its params for ledger queries.
+        """
+        conditions, params = [], []
+        if from_date is not None:
+            conditions.append('t.date >= ?')
+            params.append(from_date)
+        if till_date is not None:
+            conditions.append('t.date <= ?')
+            params.append(till_date)
+        if not exbudget:
+            conditions.append('a.exbudget = 0')
+        if not closed:
+            conditions.append('a.closed = 0')
+        return ' AND '.join(conditions) or '1', params
+
+    def select_ledger_ids(self, order, from_date, till_date, exbudget,
+                          closed):
+        """
+        Returns rowids of transactions of all accounts matching the filter,
+        sorted by given LEDGER_ORDER key and rowid in ascending order.
+        """
+        where, params = self._ledger_conditions(
+            from_date, till_date, exbudget, closed)
+        order_by = ', '.join(LEDGER_ORDER[order] + ('t.rowid', ))
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT t.rowid
+        FROM Transactions as t
+        INNER JOIN Accounts as a
+        on t.acc_id = a.rowid
+        LEFT JOIN Subcategories as s
+        on t.category_id = s.rowid
+        WHERE {}
+        ORDER BY {}""".format(where, order_by), params)
+        # Array of ints takes 8 bytes per row instead of a list of objects
+        return array('q', (rowid for rowid, in _iterate(db_cursor)))
+
+    def select_ledger_rows(self, rowids):
+        """
+        Returns transactions of the ledger by their rowids, in no order.
+        """
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT t.date, t.amount, t.info, a.name, s.parent, s.name, t.rowid
+        FROM Transactions as t
+        INNER JOIN Accounts as a
+        on t.acc_id = a.rowid
+        LEFT JOIN Subcategories as s
+        on t.category_id = s.rowid
+        WHERE t.rowid IN ({})""".format(', '.join('?' * len(rowids))),
+                          tuple(rowids))
+        return db_cursor.fetchall()
+
+    def exists_transaction(self, acc_id):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT COUNT(*)
+        FROM Transactions
+        WHERE acc_id = ?""", (acc_id,))
+        count = db_cursor.fetchone()[0]
+        return count > 0
+
+    def exists_transaction_for_category(self, category_id):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT COUNT(*)
+        FROM Transactions
+        WHERE category_id = ?""", (category_id,))
+        count = db_cursor.fetchone()[0]
+        return count > 0
+
+    def add_transaction(self, date, amount, info, acc_id, category_id):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        INSERT INTO Transactions
+        VALUES(?, ?, ?, ?, ?)
+        """, (date, amount, info, acc_id, category_id))
+        self.db_conn.commit()
+        self._touch('Transactions')
+        rowid = db_cursor.lastrowid
+        self.update_total(acc_id)
+        return date.isoformat(), amount, info, category_id, rowid
+
+    def update_transaction(self, trans_id, acc_id,  date, amount, info,
+                           category_id):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        UPDATE Transactions
+        SET date=?, amount=?, info=?, category_id=?
+        WHERE rowid=?
+        """, (date, amount, info, category_id, trans_id))
+        self.db_conn.commit()
+        self._touch('Transactions')
+        self.update_total(acc_id)
+
+    def delete_transaction(self, trans_id, acc_id):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        DELETE FROM Transactions
+        WHERE rowid=?
+        """, (trans_id, ))
+        self.db_conn.commit()
+        self._touch('Transactions')
+        self.update_total(acc_id)
+
+    # #################### Categories #####################
+
+    def select_parents(self):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT name, NULL, rowid
+        FROM Categories
+        ORDER BY name ASC""", ())
+        return db_cursor.fetchall()
+
+    def select_subcategory(self, cat_id):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT name, parent FROM Subcategories
+        WHERE rowid = ?""", (cat_id, ))
+        return db_cursor.fetchone()
+
+    def select_subcategories(self, category):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT name, parent, rowid
+        FROM Subcategories
+        WHERE parent=?""", (category, ))
+        return db_cursor.fetchall()
+
+    def exists_subcategory(self, category):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT COUNT(*)
+        FROM Subcategories
+        WHERE parent=?""", (category, ))
+        count = db_cursor.fetchone()[0]
+        return count > 0
+
+    def select_all_subcategories(self):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT name, parent, rowid
+        FROM Subcategories
+        ORDER BY parent, name""", ())
+        return db_cursor.fetchall()
+
+    def add_category(self, name):
+        db_cursor = self.db_conn.cursor()
+        try:
+            db_cursor.execute("""
+            INSERT INTO Categories
+            VALUES(?)
+            """, (name,))
+            self.db_conn.commit()
+            self._touch('Categories')
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def add_subcategory(self, name, parent):
+        db_cursor = self.db_conn.cursor()
+        try:
+            db_cursor.execute("""
+            INSERT INTO Subcategories
+            VALUES(?, ?)
+            """, (name, parent))
+            self.db_conn.commit()
+            self._touch('Subcategories')
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def delete_category(self, category):
+        # Can't delete if there is a child category
+        if self.exists_subcategory(category):
+            return False
+
+        # Delete the category
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        DELETE FROM Categories
+        WHERE name=?
+        """, (category, ))
+        self.db_conn.commit()
+        self._touch('Categories')
+        return True
+
+    def delete_subcategory(self, category_id):
+        # Can't delete if there is a transaction or budget record
+        if (self.exists_transaction_for_category(category_id) or
+                self.exists_record_for_category(category_id)):
+            return False
+
+        # Delete the subcategory
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        DELETE FROM Subcategories
+        WHERE rowid=?
+        """, (category_id, ))
+        self.db_conn.commit()
+        self._touch('Subcategories')
+        return True
+
+    # #################### Budgets ########################
+
+    def select_records(self, month, year):
+        return list(self.iter_records(month, year))
+
+    def iter_records(self, month, year):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT *, rowid
+        FROM Budget
+        WHERE month=? AND year=?""", (month, year))
+        return _iterate(db_cursor)
+
+    def select_records_for_year(self, year):
+        return list(self.iter_records_for_year(year))
+
+    def iter_records_for_year(self, year):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT *, rowid
+        FROM Budget
+        WHERE year=?""", (year,))
+        return _iterate(db_cursor)
+
+    def iter_records_for_range(self, from_year, from_month, till_year,
+                               till_month):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT *, rowid
+        FROM Budget
+        WHERE (year, month) BETWEEN (?, ?) AND (?, ?)
+        ORDER BY year, month""", (from_year, from_month, till_year, till_month))
+        return _iterate(db_cursor)
+
+    def select_record(self, rowid):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT *, rowid
+        FROM Budget
+        WHERE rowid=?""", (rowid,))
+        return db_cursor.fetchone()
+
+    def iter_all_records(self):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT *, rowid
+        FROM Budget
+        ORDER BY year, month""")
+        return _iterate(db_cursor)
+
+    def select_budget(self, month, year, category_id):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT sum(amount) FROM Budget
+        WHERE month=? AND year=? AND category_id=?""",
+                          (month, year, category_id))
+        return db_cursor.fetchone()
+
+    def select_budget_for_year(self, year, category_id):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT sum(amount) FROM Budget
+        WHERE year=? AND category_id=?""", (year, category_id))
+        return db_cursor.fetchone()
+
+    def iter_monthly_budgets(self, year):
+        """
+        Yields (category_id, month, sum) of budget records of the year.
+        """
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT category_id, month, sum(amount)
+        FROM Budget
+        WHERE year=?
+        GROUP BY category_id, month""", (year,))
+        return _iterate(db_cursor)
+
+    def exists_record_for_category(self, category_id):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT COUNT(*)
+        FROM Budget
+        WHERE category_id = ?""", (category_id,))
+        count = db_cursor.fetchone()[0]
+        return count > 0
+
+    def add_record(self, amount, category_id, budget_type, day, year, month):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        INSERT INTO Budget
+        VALUES(?, ?, ?, ?, ?, ?)
+        """, (amount, category_id, budget_type, day, year, month))
+        self.db_conn.commit()
+        self._touch('Budget')
+        rowid = db_cursor.lastrowid
+        return amount, category_id, budget_type, day, year, month, rowid
+
+    def update_record(self, amount, category_id, budget_type, day, year, month,
+                      record_id):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        UPDATE Budget
+        SET amount=?, category_id=?, type=?, day=?, year=?, month=?
+        WHERE rowid=?
+        """, (amount, category_id, budget_type, day, year, month, record_id))
+        self.db_conn.commit()
+        self._touch('Budget')
+
+    def delete_record(self, rowid):
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        DELETE FROM Budget
+        WHERE rowid=?
+        """, (rowid, ))
+        self.db_conn.commit()
+        self._touch('Budget')
+
+    # #################### Maintenance ####################
+
+    def file_size(self):
+        """
+        Returns the size of DB file in bytes.
+        """
+        return self._pragma('page_count') * self._pragma('page_size')
+
+    def free_pages(self):
+        """
+        Returns the number of free pages incremental vacuum can give back to
+        the file system, always 0 for files in other auto_vacuum modes.
+        """
+        if self._pragma('auto_vacuum') != INCREMENTAL_VACUUM:
+            return 0
+        return self._pragma('freelist_count')
+
+    def has_statistics(self):
+        """
+        Tells whether query planner statistics were ever gathered.
+        """
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("""
+        SELECT COUNT(*) FROM sqlite_master
+        WHERE name = 'sqlite_stat1'""")
+        return db_cursor.fetchone()[0] > 0
+
+    def analyze(self, limit=ANALYSIS_LIMIT):
+        """
+        Updates statistics of query planner reading at most limit rows of
+        each index.
+        """
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("PRAGMA analysis_limit = {}".format(int(limit)))
+        db_cursor.execute("ANALYZE")
+        self.db_conn.commit()
+
+    def optimize(self):
+        """
+        Lets SQLite update the statistics it finds stale, cheap enough to run
+        on every close.
+        """
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("PRAGMA optimize")
+        db_cursor.fetchall()
+        self.db_conn.commit()
+
+    def checkpoint(self):
+        """
+        Moves write ahead log into DB file and truncates it, does nothing in
+        other journal modes. Returns False if readers blocked it.
+        """
+        if self._pragma('journal_mode') != 'wal':
+            return True
+        db_cursor = self.db_conn.cursor()
+        db_cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        busy, *_ = db_cursor.fetchone()
+        return not busy
+
+    def incremental_vacuum(self, pages=0):
+        """
+        Gives up to the number of free pages back to the file system, all of
+        them if pages is 0. Returns the number of bytes reclaimed.
+        """
+        before = self.file_size()
+        # Every step of the statement frees a single page, script runs it to
+        # completion
+        self.db_conn.commit()
+        self.db_conn.executescript(
+            "PRAGMA incremental_vacuum({});".format(int(pages)))
+        return before - self.file_size()
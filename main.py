@@ -1,6 +1,6 @@
 from PyQt5.QtWidgets import QApplication, QMainWindow, QFileDialog,\
     QMessageBox, QHeaderView
-from PyQt5.QtCore import QModelIndex, Qt
+from PyQt5.QtCore import QModelIndex, Qt, QTimer, QThread, pyqtSignal
 from PyQt5.QtWidgets import QLabel
 from ui.QBar import QBar
 
@@ -10,18 +10,17 @@ from ui.mainWindow import Ui_MainWindow
 import os
 import sys
 import logging
+import sqlite3
 from collections import OrderedDict
 import datetime
 
 import config
-from enums import ACCOUNT_TYPES
-from utils import Account, ORM
-from accountsManager import AccountsManager
-from categoriesManager import CategoriesManager
-from transactionsRoll import TransactionsRoll
-from budgetManager import BudgetManager
-from budgetReport import BudgetReport
-from balanceReport import BalanceReport
+from core.enums import ACCOUNT_TYPES
+from core import Account, ORM
+from core.maintenance import Maintenance
+from core.events import AccountChanged, BudgetRecordChanged, TRANSACTION_EVENTS,\
+    affected_categories
+# Dialog modules are imported on demand to keep start up fast
 
 # Define working directory for app
 if "APPDATA" in os.environ:  # We are on Windows
@@ -31,6 +30,35 @@ elif "HOME" in os.environ:  # We are on Linux
 else:  # Fallback to our working dir
     APP_DATA_PATH = os.getcwd()
 
+# Time without changes in DB after which its maintenance runs, msec
+MAINTENANCE_DELAY = 10000
+# Statements slower than this are logged with their query plans, msec.
+# None turns the log off
+SLOW_QUERY = None
+
+# Slots of main window actions and methods loading dialogs, which are
+# profiled in profiling mode and traced in tracing mode
+PROFILED_SLOTS = ('choose_file', 'create_file', 'close_file',
+                  'manage_accounts', 'manage_categories', 'manage_budget',
+                  'report_budget', 'report_balance', 'report_budget_matrix',
+                  'report_trends', 'report_balance_history', 'report_heatmap',
+                  'search_transactions', 'show_ledger', 'account_clicked')
+PROFILED_DIALOGS = (
+    ('transactionsRoll', 'TransactionsRoll', ('show_transactions', )),
+    ('budgetReport', 'BudgetReport', ('load_budget_bars', )),
+    ('balanceReport', 'BalanceReport', ('load_balance', )),
+    ('budgetManager', 'BudgetManager', ('load_budget_records', )),
+    ('categoriesManager', 'CategoriesManager', ('show_categories', )),
+    ('budgetMatrix', 'BudgetMatrix', ('load_matrix', )),
+    ('categoryTrends', 'CategoryTrends', ('load_trends', )),
+    ('balanceHistory', 'BalanceHistory', ('load_chart', )),
+    ('calendarHeatmap', 'CalendarHeatmap', ('load_heatmap', )),
+    # Ledger pages and search as you type run on every scroll and keystroke,
+    # only the sort or filter and the query committed by Enter are profiled
+    ('transactionsLedger', 'TransactionsLedger', ('row_ids', )),
+    ('searchTransactions', 'SearchTransactions', ('commit_search', )),
+)
+
 
 def update_recent(name=''):
     """
@@ -55,17 +83,25 @@ def order_accounts(accounts):
 
 
 class AccountsTree(TreeModel):
-    def __init__(self, orm):
+    def __init__(self, orm, accounts=None):
         super().__init__(('Account', 'Balance'))
         self.orm = orm
-        self._update_accounts()
+        # Items that have to be patched when balance changes
+        self.account_items = {}
+        self.subtotal_items = {}
+        self.total_item = None
+        # Accounts in the tree, their balances are patched with the tree
+        self.accounts = None
+        self._update_accounts(accounts)
 
-    def _update_accounts(self):
+    def _update_accounts(self, accounts=None):
         """
-        Fetches account list from DB and builds a tree model of accounts.
-        Adds subtotal and grand total to that model.
+        Fetches account list from DB unless it is given and builds a tree
+        model of accounts. Adds subtotal and grand total to that model.
         """
-        accounts = self.orm.fetch_accounts_summary()
+        if accounts is None:
+            accounts = self.orm.fetch_accounts_summary()
+        self.accounts = accounts
         account_dict = order_accounts(accounts)
 
         for key, accs in account_dict.items():
@@ -74,16 +110,79 @@ class AccountsTree(TreeModel):
             for acc in accs:
                 acc_item = TreeItem(acc, item)
                 item.appendChild(acc_item)
+                self.account_items[acc.id] = acc_item
             # Add type total
             if len(accs) > 1:
                 sub_balance = sum(acc.balance for acc in accs if not acc.exbudget)
                 subtotal = TreeItem(('Total', sub_balance), item)
                 item.appendChild(subtotal)
+                self.subtotal_items[key] = subtotal
 
         # Add grand total
         total_balance = sum([acc.balance for acc in accounts if not acc.exbudget])
         total = TreeItem(('Grand Total', total_balance), self.rootItem)
         self.rootItem.appendChild(total)
+        self.total_item = total
+
+    def update_balance(self, account, delta):
+        """
+        Changes the balance of the account by delta and patches the totals
+        that include the account.
+        """
+        acc_item = self.account_items.get(account.id)
+        if acc_item is None:  # Closed accounts are not in the tree
+            return
+
+        acc = acc_item.itemData
+        acc.balance += delta
+        changed = [acc_item]
+
+        if not acc.exbudget:
+            for total in (self.subtotal_items.get(acc.type), self.total_item):
+                if total is not None:
+                    name, balance = total.itemData
+                    total.itemData = (name, balance + delta)
+                    changed.append(total)
+
+        for item in changed:
+            index = self.createIndex(item.row(), 1, item)
+            self.dataChanged.emit(index, index)
+
+
+class ReportsCheck(QThread):
+    """
+    Reads accounts summary and budget bars for the period through its own
+    read-only connection, so reports shown from the cache are checked
+    against DB without blocking GUI.
+    """
+    checked = pyqtSignal(object, object, object)  # revision, accounts, bars
+
+    def __init__(self, db_path, month, year):
+        super().__init__()
+        self.db_path = db_path
+        self.month = month
+        self.year = year
+
+    def run(self):
+        try:
+            orm = ORM(self.db_path, readonly=True)
+        except sqlite3.Error as e:
+            logging.warning("Can't check reports of %s: %s", self.db_path, e)
+            return
+        db_conn = orm.storage.db_conn
+        try:
+            # The revision and reports are read from the same snapshot
+            db_conn.execute("BEGIN")
+            revision = orm.storage.select_revision()
+            accounts = orm.fetch_accounts_summary()
+            bars = list(orm.fetch_budget_report_bars(self.month, self.year))
+            db_conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            logging.warning("Can't check reports of %s: %s", self.db_path, e)
+            return
+        finally:
+            db_conn.close()
+        self.checked.emit(revision, accounts, bars)
 
 
 class MainWindow(Ui_MainWindow, QMainWindow):
@@ -92,6 +191,21 @@ class MainWindow(Ui_MainWindow, QMainWindow):
 
         self.orm = None
         self.accounts = None
+        # Widgets of budget bars by category id
+        self.bars = {}
+        # Month and year of the budget report shown
+        self.bars_period = None
+        # Background check of reports shown from the cache
+        self.reports_check = None
+        # Performance panel in status bars, while it is on
+        self.hud = None
+        # Maintenance of opened file and its steps while they are running
+        self.maintenance = None
+        self.maintenance_steps = None
+        self.maintenance_timer = QTimer(self)
+        self.maintenance_timer.setSingleShot(True)
+        self.maintenance_timer.setInterval(MAINTENANCE_DELAY)
+        self.maintenance_timer.timeout.connect(self.start_maintenance)
 
         # Set up the user interface
         self.setupUi(self)
@@ -111,31 +225,42 @@ class MainWindow(Ui_MainWindow, QMainWindow):
         self.actionAbout.triggered.connect(self.show_about)
         self.actionBudgetReport.triggered.connect(self.report_budget)
         self.actionBalance.triggered.connect(self.report_balance)
+        self.actionSearch.triggered.connect(self.search_transactions)
+        self.actionLedger.triggered.connect(self.show_ledger)
+        self.actionBudgetMatrix.triggered.connect(self.report_budget_matrix)
+        self.actionTrends.triggered.connect(self.report_trends)
+        self.actionBalanceHistory.triggered.connect(
+            self.report_balance_history)
+        self.actionHeatmap.triggered.connect(self.report_heatmap)
+        self.actionPerformanceHud.toggled.connect(self.toggle_hud)
 
         self.accountsTree.doubleClicked.connect(self.account_clicked)
 
         # Try to open the most recent file
         self.load_recent_file()
 
-    def show_accounts(self):
+    def show_accounts(self, accounts=None):
         """
         Reloads the account model into view.
         """
-        self.accounts = AccountsTree(self.orm)
+        self.accounts = AccountsTree(self.orm, accounts)
         self.accountsTree.setModel(self.accounts)
         self.accountsTree.expandAll()
 
-    def show_budget_report(self):
+    def show_budget_report(self, bars=None):
         """
-        Loads the budget report from DB for current month and year and puts
-        it into GUI.
+        Loads the budget report from DB for current month and year, unless
+        bars are given, and puts it into GUI.
         """
         self.clear_bars()
 
         year = datetime.date.today().year
         month = datetime.date.today().month
+        self.bars_period = (month, year)
 
-        for budget_bar in self.orm.fetch_budget_report_bars(month, year):
+        if bars is None:
+            bars = self.orm.fetch_budget_report_bars(month, year)
+        for budget_bar in bars:
             self.add_bar(budget_bar)
 
         self.barsLayout.setColumnStretch(1, 1)
@@ -144,6 +269,7 @@ class MainWindow(Ui_MainWindow, QMainWindow):
         """
         Clears the widget for budget report.
         """
+        self.bars = {}
         for i in reversed(range(self.barsLayout.count())):
             widget = self.barsLayout.itemAt(i).widget()
             # Detach from layout
@@ -158,10 +284,101 @@ class MainWindow(Ui_MainWindow, QMainWindow):
         category = budget_bar.category
         category_text = category.parent + '::' + category.name
         position = self.barsLayout.rowCount() + 1
-        self.barsLayout.addWidget(QLabel(category_text), position, 0)
+        label = QLabel(category_text)
+        self.barsLayout.addWidget(label, position, 0)
         bar = QBar(budget_bar)
         self.barsLayout.addWidget(bar, position, 1)
-        self.barsLayout.addWidget(QLabel(budget_bar.expectation), position, 2)
+        expectation = QLabel(budget_bar.expectation)
+        self.barsLayout.addWidget(expectation, position, 2)
+        self.bars[category.id] = (label, bar, expectation)
+
+    def update_bar(self, category):
+        """
+        Recalculates the budget bar of single category for current month.
+        """
+        today = datetime.date.today()
+        budget_bar = self.orm.fetch_budget_report_bar(
+            today.month, today.year, category)
+        widgets = self.bars.get(category.id)
+
+        if widgets and budget_bar:
+            _, bar, expectation = widgets
+            bar.setModel(budget_bar)
+            expectation.setText(budget_bar.expectation)
+        elif widgets:
+            del self.bars[category.id]
+            for widget in widgets:
+                self.barsLayout.removeWidget(widget)
+                widget.setParent(None)
+        elif budget_bar:
+            self.add_bar(budget_bar)
+
+    def data_changed(self, event):
+        """
+        Patches the accounts tree and budget bars affected by the change
+        in DB.
+        """
+        today = datetime.date.today()
+        if isinstance(event, AccountChanged):
+            # Tree structure and budget accounts may have changed
+            self.show_accounts()
+            self.show_budget_report()
+        elif isinstance(event, TRANSACTION_EVENTS):
+            self.accounts.update_balance(event.account, event.delta)
+            for category, date in affected_categories(event):
+                if (date.year, date.month) == (today.year, today.month):
+                    self.update_bar(category)
+        elif isinstance(event, BudgetRecordChanged):
+            if (event.year, event.month) == (today.year, today.month):
+                self.update_bar(event.category)
+
+        # Maintenance waits till DB is idle unless there were many writes
+        if self.maintenance.urgent():
+            self.start_maintenance()
+        else:
+            self.maintenance_timer.start()
+
+    def start_maintenance(self):
+        """
+        Starts maintenance of the file if it is needed, the steps are run
+        one by one between events.
+        """
+        if self.maintenance is None or self.maintenance_steps is not None or\
+                not self.maintenance.needed():
+            return
+        self.maintenance_steps = (self.maintenance.reclaimed,
+                                  self.maintenance.steps())
+        QTimer.singleShot(0, self.maintenance_step)
+
+    def maintenance_step(self):
+        if self.maintenance_steps is None:  # File is closed
+            return
+        reclaimed, steps = self.maintenance_steps
+        try:
+            next(steps)
+        except StopIteration:
+            self.maintenance_steps = None
+            reclaimed = self.maintenance.reclaimed - reclaimed
+            if reclaimed:
+                message = "Maintenance reclaimed {:.1f} MiB".format(
+                    reclaimed / 2 ** 20)
+                logging.info(message)
+                self.statusBar.showMessage(message, 5000)
+        else:
+            QTimer.singleShot(0, self.maintenance_step)
+
+    def finish_maintenance(self):
+        """
+        Runs the rest of maintenance before the file is closed.
+        """
+        self.maintenance_timer.stop()
+        self.maintenance_steps = None
+        if self.maintenance is not None:
+            self.maintenance.close()
+            logging.info("Maintenance reclaimed %d bytes of %s",
+                         self.maintenance.reclaimed,
+                         self.maintenance.storage.db_path)
+            self.maintenance = None
 
     def load_recent_file(self):
         """
@@ -206,21 +423,79 @@ class MainWindow(Ui_MainWindow, QMainWindow):
         """
         Opens the DB file.
         """
+        self.stop_reports_check()
+        self.finish_maintenance()
         # read dbfile and load data
-        self.orm = ORM(name)
-
-        self.show_accounts()
-        self.show_budget_report()
+        self.orm = ORM(name, slow_query=SLOW_QUERY)
+        self.orm.events.subscribe(self.data_changed)
+        self.maintenance = Maintenance(self.orm.storage)
+        self.maintenance_timer.start()
+
+        today = datetime.date.today()
+        reports = self.orm.load_start_reports(today.month, today.year)
+        if reports is None:
+            self.show_accounts()
+            self.show_budget_report()
+            self.save_reports()
+        else:
+            # Show reports saved for this DB revision and check them
+            # in the background
+            self.show_accounts(reports[0])
+            self.show_budget_report(reports[1])
+            self.reports_check = ReportsCheck(name, today.month, today.year)
+            self.reports_check.checked.connect(self.revalidate_reports)
+            self.reports_check.start()
 
         # update recent filename
         update_recent(name)
         # update window title
         self.setWindowTitle(' -- '.join((config.APPNAME, name)))
 
+    def revalidate_reports(self, revision, accounts, bars):
+        """
+        Rebuilds reports shown from the cache if they differ from the ones
+        read by the background check.
+        """
+        # Changes made since the check are already patched into reports
+        if self.orm is None or revision != self.orm.storage.select_revision():
+            return
+
+        if [tuple(a) for a in self.accounts.accounts] !=\
+                [tuple(a) for a in accounts]:
+            self.show_accounts(accounts)
+        if self.shown_bars() != bars:
+            self.show_budget_report(bars)
+        self.save_reports()
+
+    def stop_reports_check(self):
+        """
+        Drops the result of background check, waits for it to finish.
+        """
+        if self.reports_check is not None:
+            self.reports_check.checked.disconnect()
+            self.reports_check.wait()
+            self.reports_check = None
+
+    def shown_bars(self):
+        return [bar.model for _, bar, _ in self.bars.values()]
+
+    def save_reports(self):
+        """
+        Saves reports shown for the opened file to show them fast next
+        time.
+        """
+        if self.orm is not None:
+            month, year = self.bars_period
+            self.orm.save_start_reports(month, year, self.accounts.accounts,
+                                        self.shown_bars())
+
     def close_file(self):
         """
         Closes the DB file and cleans up GUI.
         """
+        self.stop_reports_check()
+        self.save_reports()
+        self.finish_maintenance()
         # Clear the budget report
         self.clear_bars()
         # Clear the accounts tree view
@@ -245,6 +520,7 @@ class MainWindow(Ui_MainWindow, QMainWindow):
         """
         if self.orm and self.accounts:
 
+            from accountsManager import AccountsManager
             acc_manager = AccountsManager(self.orm)
 
             self.menuBar.setEnabled(False)
@@ -253,15 +529,12 @@ class MainWindow(Ui_MainWindow, QMainWindow):
 
             self.menuBar.setEnabled(True)
 
-            # Update if there was changes
-            self.show_accounts()
-            self.show_budget_report()
-
     def manage_categories(self):
         """
         Fires up the widget to manage accounts
         """
         if self.orm and self.accounts:
+            from categoriesManager import CategoriesManager
             cat_manager = CategoriesManager(self.orm)
 
             self.menuBar.setEnabled(False)
@@ -275,6 +548,7 @@ class MainWindow(Ui_MainWindow, QMainWindow):
         Fires up the widget to manage budget
         """
         if self.orm and self.accounts:
+            from budgetManager import BudgetManager
             budget_manager = BudgetManager(self.orm)
 
             self.menuBar.setEnabled(False)
@@ -282,14 +556,13 @@ class MainWindow(Ui_MainWindow, QMainWindow):
             budget_manager.exec()
 
             self.menuBar.setEnabled(True)
-            # Update budget report
-            self.show_budget_report()
 
     def report_budget(self):
         """
         Fires up the widget with budget report.
         """
         if self.orm and self.accounts:
+            from budgetReport import BudgetReport
             report = BudgetReport(self.orm)
             self.menuBar.setEnabled(False)
             report.exec()
@@ -300,11 +573,97 @@ class MainWindow(Ui_MainWindow, QMainWindow):
         Fires up the widget with balance report.
         """
         if self.orm and self.accounts:
+            from balanceReport import BalanceReport
             report = BalanceReport(self.orm)
             self.menuBar.setEnabled(False)
             report.exec()
             self.menuBar.setEnabled(True)
 
+    def report_budget_matrix(self):
+        """
+        Fires up the widget with budget matrix of the year.
+        """
+        if self.orm and self.accounts:
+            from budgetMatrix import BudgetMatrix
+            report = BudgetMatrix(self.orm)
+            self.menuBar.setEnabled(False)
+            report.exec()
+            self.menuBar.setEnabled(True)
+
+    def report_trends(self):
+        """
+        Fires up the widget with spending trends of categories.
+        """
+        if self.orm and self.accounts:
+            from categoryTrends import CategoryTrends
+            report = CategoryTrends(self.orm)
+            self.menuBar.setEnabled(False)
+            report.exec()
+            self.menuBar.setEnabled(True)
+
+    def report_balance_history(self):
+        """
+        Fires up the widget with chart of daily balance.
+        """
+        if self.orm and self.accounts:
+            from balanceHistory import BalanceHistory
+            report = BalanceHistory(self.orm)
+            self.menuBar.setEnabled(False)
+            report.exec()
+            self.menuBar.setEnabled(True)
+
+    def report_heatmap(self):
+        """
+        Fires up the widget with calendar of daily spending.
+        """
+        if self.orm and self.accounts:
+            from calendarHeatmap import CalendarHeatmap
+            report = CalendarHeatmap(self.orm)
+            self.menuBar.setEnabled(False)
+            report.exec()
+            self.menuBar.setEnabled(True)
+
+    def search_transactions(self):
+        """
+        Fires up the widget to search transactions of all accounts.
+        """
+        if self.orm and self.accounts:
+            from searchTransactions import SearchTransactions
+            search = SearchTransactions(self.orm)
+            self.menuBar.setEnabled(False)
+            search.exec()
+            self.menuBar.setEnabled(True)
+
+    def show_ledger(self):
+        """
+        Fires up the widget with transactions of all accounts.
+        """
+        if self.orm and self.accounts:
+            from transactionsLedger import TransactionsLedger
+            ledger = TransactionsLedger(self.orm)
+            self.menuBar.setEnabled(False)
+            ledger.exec()
+            self.menuBar.setEnabled(True)
+
+    def closeEvent(self, event):
+        self.stop_reports_check()
+        self.save_reports()
+        self.finish_maintenance()
+        super().closeEvent(event)
+
+    def toggle_hud(self, checked):
+        """
+        Shows or hides performance panel in the status bars.
+        """
+        if checked:
+            from ui.helpers import PerformanceHud
+            self.hud = PerformanceHud(
+                self.statusBar,
+                lambda: self.orm.storage.db_conn.stats if self.orm else None)
+        elif self.hud is not None:
+            self.hud.close()
+            self.hud = None
+
     def show_about(self):
         message = " ".join([config.APPNAME, config.VERSION, '\n'])
         message += "Icons are designed by Freepik."
@@ -319,6 +678,7 @@ class MainWindow(Ui_MainWindow, QMainWindow):
         if not isinstance(account, Account):
             return
 
+        from transactionsRoll import TransactionsRoll
         transaction_manager = TransactionsRoll(self.orm, account)
 
         self.menuBar.setEnabled(False)
@@ -327,9 +687,50 @@ class MainWindow(Ui_MainWindow, QMainWindow):
 
         self.menuBar.setEnabled(True)
 
-        # Update if there was changes
-        self.show_accounts()
-        self.show_budget_report()
+
+def enable_profiling():
+    """
+    Profiles main window actions and dialog loading, profiles are saved
+    into the app data dir.
+    """
+    import importlib
+    from core.profiling import profile_methods
+
+    profile_methods(MainWindow, PROFILED_SLOTS, APP_DATA_PATH)
+    for module_name, class_name, methods in PROFILED_DIALOGS:
+        module = importlib.import_module(module_name)
+        profile_methods(getattr(module, class_name), methods, APP_DATA_PATH)
+
+
+def enable_tracing():
+    """
+    Traces main window actions, rebuilds of widgets and models and starts
+    collecting spans.
+    """
+    import importlib
+    from core import tracing
+
+    tracing.trace_methods(MainWindow, PROFILED_SLOTS, 'action')
+    tracing.trace_methods(MainWindow, ('show_accounts', 'show_budget_report'),
+                          'widget')
+    tracing.trace_methods(AccountsTree, ('_update_accounts', ), 'model')
+    for module_name, class_name, methods in PROFILED_DIALOGS:
+        module = importlib.import_module(module_name)
+        tracing.trace_methods(getattr(module, class_name), methods, 'widget')
+    tracing.start()
+
+
+def save_trace():
+    """
+    Saves the spans collected into the app data dir.
+    """
+    from core import tracing
+
+    path = os.path.join(APP_DATA_PATH, 'trace-{:%Y%m%d-%H%M%S}.json'.format(
+        datetime.datetime.now()))
+    tracing.save(path, tracing.stop())
+    logging.info("Trace saved to %s", path)
+
 
 if __name__ == '__main__':
     # Ensure consistency of data dir
@@ -341,21 +742,42 @@ if __name__ == '__main__':
 
     log_name = os.path.join(APP_DATA_PATH, config.LOG)
 
+    # Profiling, tracing and slow query log are opt in by --profile,
+    # --trace and --slow-query flags or SIMPLEBUDGET_PROFILE,
+    # SIMPLEBUDGET_TRACE and SIMPLEBUDGET_SLOW_QUERY
+    from core import profiling, tracing
+    from core.instrument import slow_query_threshold
+    profile = profiling.requested(sys.argv)
+    trace = tracing.requested(sys.argv)
+    SLOW_QUERY = slow_query_threshold(sys.argv)
+
     logging.basicConfig(
         filename=log_name,
         format='%(asctime)s %(message)s',
-        level=logging.ERROR)
-        # level=logging.INFO)
+        level=logging.INFO if profile or trace or SLOW_QUERY is not None
+        else logging.ERROR)
     logging.info("app_data_path:" + APP_DATA_PATH)
 
+    if profile:
+        enable_profiling()
+    if trace:
+        enable_tracing()
+
     try:
-        app = QApplication(sys.argv)
+        if trace:
+            from ui.helpers import TracedApplication
+            app = TracedApplication(sys.argv)
+        else:
+            app = QApplication(sys.argv)
 
         form = MainWindow()
 
         form.show()
 
-        sys.exit(app.exec())
+        result = app.exec()
+        if trace:
+            save_trace()
+        sys.exit(result)
 
     except Exception as e:
         logging.exception(e)
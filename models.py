@@ -2,6 +2,10 @@ from PyQt5.QtCore import QAbstractItemModel, QModelIndex, Qt,\
     QAbstractListModel, QVariant, QAbstractTableModel
 from decimal import Decimal
 from datetime import date
+from itertools import islice
+from collections import OrderedDict
+from core.helpers import from_cents
+from core.tracing import traced, span
 
 
 class TreeItem:
@@ -244,6 +248,170 @@ class TableModel(QAbstractTableModel):
         self.dataChanged.emit(self.index(0, 0), self.index(0, 0))
         return 0  # row
 
+    @traced('model')
+    def addRows(self, items, chunk_size=500):
+        """
+        Consumes iterable of items as they arrive, inserting them in chunks.
+        The order of rows is the same as after calling addRow for each item.
+        """
+        items = iter(items)
+        while True:
+            chunk = list(islice(items, chunk_size))
+            if not chunk:
+                break
+            chunk.reverse()
+            self.beginInsertRows(QModelIndex(), 0, len(chunk) - 1)
+            self.items[0:0] = chunk
+            self.endInsertRows()
+
+
+class PagedTableModel(QAbstractTableModel):
+    """
+    Read only table model for large number of rows. Keeps in memory only
+    the keys of all rows, sorted by the source once per sort column and
+    reload, and the pages of rows recently shown by the view. Each page is
+    fetched by its keys, so its cost does not depend on its position.
+    :param keys: callable(column) returning keys of all rows in ascending
+    order of the column
+    :param fetch: callable(keys) returning the rows of the keys in their order
+    """
+
+    def __init__(self, headers, keys, fetch, page_size=200, max_pages=20):
+        super().__init__()
+
+        self.headers = headers
+        self.keys = keys
+        self.fetch = fetch
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.sort_column = 0
+        self.descending = False
+        self.pages = OrderedDict()
+        self.row_keys = self.keys(self.sort_column)
+
+    def rowCount(self, parent=None, *args, **kwargs):
+        return len(self.row_keys)
+
+    def page_keys(self, number):
+        start = number * self.page_size
+        end = start + self.page_size
+        if not self.descending:
+            return self.row_keys[start:end]
+        # Descending order is ascending one read from the end
+        count = len(self.row_keys)
+        return self.row_keys[max(count - end, 0):count - start][::-1]
+
+    def columnCount(self, parent=None, *args, **kwargs):
+        return len(self.headers)
+
+    def row(self, row):
+        """
+        Returns the row, fetching its page if needed.
+        """
+        number, position = divmod(row, self.page_size)
+        if number in self.pages:
+            self.pages.move_to_end(number)
+        else:
+            with span('PagedTableModel.fetch', 'model', page=number):
+                self.pages[number] = self.fetch(self.page_keys(number))
+            while len(self.pages) > self.max_pages:
+                self.pages.popitem(last=False)
+        return self.pages[number][position]
+
+    def data(self, index, role=None):
+        if not index.isValid():
+            return QVariant()
+        if role == Qt.UserRole:
+            return self.row(index.row())
+        elif role != Qt.DisplayRole:
+            return QVariant()
+
+        data = self.row(index.row())[index.column()]
+        if isinstance(data, Decimal):
+            return "{0:.2f}".format(data)
+        elif isinstance(data, date):
+            return str(data)
+        else:
+            return QVariant(data)
+
+    def headerData(self, col, orientation, role=None):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return QVariant(self.headers[col])
+        return QVariant()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        descending = order == Qt.DescendingOrder
+        if column == self.sort_column:
+            # Keys are already sorted, only the pages are read from the
+            # other end
+            if descending != self.descending:
+                self.beginResetModel()
+                self.descending = descending
+                self.pages.clear()
+                self.endResetModel()
+            return
+        self.sort_column = column
+        self.descending = descending
+        self.reload()
+
+    @traced('model')
+    def reload(self):
+        """
+        Drops fetched pages and reads the keys of rows again.
+        """
+        self.beginResetModel()
+        self.pages.clear()
+        self.row_keys = self.keys(self.sort_column)
+        self.endResetModel()
+
+
+class MatrixModel(QAbstractTableModel):
+    """
+    Read only table model over 2D array of cents, the view asks only for
+    the cells it shows. Rows and columns have headers, NaN is shown empty.
+    """
+
+    def __init__(self, row_headers, headers, matrix=None):
+        super().__init__()
+
+        self.row_headers = row_headers
+        self.headers = headers
+        self.matrix = matrix
+
+    def rowCount(self, parent=None, *args, **kwargs):
+        return len(self.row_headers) if self.matrix is not None else 0
+
+    def columnCount(self, parent=None, *args, **kwargs):
+        return len(self.headers)
+
+    def data(self, index, role=None):
+        if not index.isValid():
+            return QVariant()
+        if role == Qt.DisplayRole:
+            cents = self.matrix[index.row(), index.column()]
+            if cents != cents:  # NaN, no value
+                return QVariant()
+            return "{0:.2f}".format(from_cents(int(round(cents))))
+        elif role == Qt.TextAlignmentRole:
+            return Qt.AlignRight | Qt.AlignVCenter
+        return QVariant()
+
+    def headerData(self, section, orientation, role=None):
+        if role != Qt.DisplayRole:
+            return QVariant()
+        if orientation == Qt.Horizontal:
+            return QVariant(self.headers[section])
+        return QVariant(self.row_headers[section])
+
+    @traced('model')
+    def setMatrix(self, row_headers, matrix, headers=None):
+        self.beginResetModel()
+        self.row_headers = row_headers
+        self.matrix = matrix
+        if headers is not None:
+            self.headers = headers
+        self.endResetModel()
+
 
 class CategoryListModel(ListModel):
     def data(self, index, role=None):
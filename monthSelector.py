@@ -1,17 +1,17 @@
 from PyQt5.Qt import QDialog, pyqtSignal
 import ui.selectMonth
-from enums import YEARS, MONTHS
+from core.enums import MONTHS
 
 
 class Selector(ui.selectMonth.Ui_Dialog, QDialog):
     monthSelected = pyqtSignal(int, int)
 
-    def __init__(self):
+    def __init__(self, years):
         super().__init__()
         self.setupUi(self)
 
         self.monthBox.addItems(MONTHS[1:])
-        self.yearBox.addItems(YEARS)
+        self.yearBox.addItems(years)
 
     def accept(self):
         self.monthSelected.emit(self.monthBox.currentIndex() + 1,
@@ -2,8 +2,8 @@ from PyQt5.Qt import QDialog, pyqtSignal, QDate, Qt
 from ui.manageRecord import Ui_Dialog
 from calendar import monthrange
 from models import CategoryListModel
-from enums import YEARS, MONTHS, DAYS, BUDGET_TYPES
-from utils import to_cents
+from core.enums import MONTHS, DAYS, BUDGET_TYPES
+from core.helpers import to_cents
 
 
 class Manager(Ui_Dialog, QDialog):
@@ -16,11 +16,12 @@ class Manager(Ui_Dialog, QDialog):
     # amount, category_id, type, day, year, month, record_id
     editedRecord = pyqtSignal(int, object, str, int, int, int, int)
 
-    def __init__(self, categories, record=None):
+    def __init__(self, categories, years, record=None):
         super().__init__()
         self.setupUi(self)
 
         self.categories = categories
+        self.years = years
         self.record = record
 
         self.setup()
@@ -48,7 +49,7 @@ class Manager(Ui_Dialog, QDialog):
         self.categoryBox.setModel(self.categories_model)
 
         # Add years
-        self.yearBox.addItems(YEARS)
+        self.yearBox.addItems(self.years)
         self.monthBox.addItems(MONTHS[1:])
 
         # Set behaviour for days spinbox
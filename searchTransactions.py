@@ -0,0 +1,49 @@
+from PyQt5.Qt import QDialog, QHeaderView
+import time
+
+from ui.searchTransactions import Ui_Dialog
+from models import TableModel
+
+
+class SearchTransactions(Ui_Dialog, QDialog):
+    """
+    GUI that finds transactions of all accounts by their info.
+    """
+    def __init__(self, orm):
+        super().__init__()
+        self.setupUi(self)
+
+        self.orm = orm
+
+        self.results = TableModel(
+            ("Date", "Amount", "Info", "Account", "Category"))
+        self.resultsView.setModel(self.results)
+        self.resultsView.horizontalHeader().setSectionResizeMode(
+            QHeaderView.Stretch)
+
+        self.searchEdit.textChanged.connect(self.search)
+        self.searchEdit.returnPressed.connect(self.commit_search)
+
+    def search(self, text):
+        """
+        Shows transactions matching the text, best matches on top.
+        """
+        self.results.prepare()
+
+        start = time.perf_counter()
+        results = self.orm.search_transactions(text)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        # addRows puts the first item at the bottom
+        self.results.addRows(reversed(results))
+        if text.strip():
+            self.statusLabel.setText(
+                "{} matches in {:.0f} ms".format(len(results), elapsed))
+        else:
+            self.statusLabel.setText("")
+
+    def commit_search(self):
+        """
+        Searches the text again once it is committed by Enter.
+        """
+        self.search(self.searchEdit.text())
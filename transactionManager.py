@@ -2,7 +2,7 @@ from PyQt5.Qt import QDialog, pyqtSignal, QDate, Qt
 from ui.manageTransaction import Ui_manageTransaction
 import datetime
 from models import CategoryListModel
-from utils import to_cents
+from core.helpers import to_cents
 
 
 class Manager(Ui_manageTransaction, QDialog):
@@ -0,0 +1,62 @@
+from PyQt5.Qt import QDialog, QDate, QHeaderView
+from ui.transactionsLedger import Ui_Dialog
+from models import PagedTableModel
+
+
+class TransactionsLedger(Ui_Dialog, QDialog):
+    """
+    GUI that shows transactions of all accounts in one table. Rows are
+    fetched from DB page by page as the view scrolls.
+    """
+    def __init__(self, orm):
+        super().__init__()
+        self.setupUi(self)
+
+        self.orm = orm
+
+        current_date = QDate.currentDate()
+        self.fromDate.setDate(QDate(current_date.year(), 1, 1))
+        self.toDate.setDate(current_date)
+
+        self.ledger = PagedTableModel(
+            ("Date", "Amount", "Info", "Account", "Category"),
+            self.row_ids, self.fetch_rows)
+        self.ledgerView.setModel(self.ledger)
+        self.ledgerView.horizontalHeader().setSectionResizeMode(
+            QHeaderView.Stretch)
+        self.ledger.modelReset.connect(self.show_count)
+        self.show_count()
+
+        # Connect signals and slots
+        self.rangeBox.toggled.connect(lambda checked: self.ledger.reload())
+        self.fromDate.dateChanged.connect(self.range_changed)
+        self.toDate.dateChanged.connect(self.range_changed)
+        self.exBudgetBox.toggled.connect(lambda checked: self.ledger.reload())
+        self.closedBox.toggled.connect(lambda checked: self.ledger.reload())
+
+    def filter(self):
+        """
+        Returns keyword arguments of ledger queries for current filter.
+        """
+        from_date = till_date = None
+        if self.rangeBox.isChecked():
+            from_date = self.fromDate.date().toPyDate()
+            till_date = self.toDate.date().toPyDate()
+        return dict(from_date=from_date, till_date=till_date,
+                    exbudget=self.exBudgetBox.isChecked(),
+                    closed=self.closedBox.isChecked())
+
+    def row_ids(self, column):
+        return self.orm.fetch_ledger_ids(self.orm.LEDGER_COLUMNS[column],
+                                         **self.filter())
+
+    def fetch_rows(self, ids):
+        return self.orm.fetch_ledger_rows(ids)
+
+    def range_changed(self, date):
+        if self.rangeBox.isChecked():
+            self.ledger.reload()
+
+    def show_count(self):
+        self.countLabel.setText(
+            "{} transactions".format(self.ledger.rowCount()))
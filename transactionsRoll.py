@@ -38,9 +38,7 @@ class TransactionsRoll(Ui_Dialog, QDialog):
         Fetches transactions from DB and shows them.
         """
         self.roll.prepare()
-        transactions = self.orm.fetch_transactions(self.account)
-        for tr in transactions:
-            self.roll.addRow(tr)
+        self.roll.addRows(self.orm.iter_transactions(self.account))
 
     def add_transaction(self):
         """
@@ -30,6 +30,15 @@ class QBar(QWidget):
         self.normal_color = normal_color
         self.exceed_color = exceed_color
 
+    def setModel(self, model):
+        """
+        Replaces the model of the bar and redraws it.
+        """
+        self.model = model
+        self.value = model.value
+        self.max = model.maximum
+        self.update()
+
     def paintEvent(self, e):
 
         qp = QPainter()
@@ -72,7 +81,7 @@ class QBar(QWidget):
         # Print the maximum value at the center
         font = QFont('Serif', 7, QFont.Light)
         qp.setFont(font)
-        qp.drawText(w/2, h/2, '{} / {}'.format(self.value, self.max))
+        qp.drawText(w // 2, h // 2, '{} / {}'.format(self.value, self.max))
 
     def mousePressEvent(self, QMouseEvent):
         self.mousePressed.emit(self)
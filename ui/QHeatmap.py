@@ -0,0 +1,125 @@
+from PyQt5.QtWidgets import QWidget, QSizePolicy, QToolTip
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QPainter, QFont, QColor
+import datetime
+
+from core.enums import MONTHS, DAYS
+
+
+class QHeatmap(QWidget):
+    """
+    Custom QWidget that draws a year as a calendar of weeks by days of week
+    colored by the sum of the day: red for spending, green for income.
+    All days are painted by the widget itself.
+    """
+
+    daySelected = pyqtSignal(object)
+
+    # Space for labels of months and days of week, pixels
+    LEFT = 30
+    TOP = 16
+
+    def __init__(self, empty_color=QColor(230, 230, 230)):
+        super().__init__()
+
+        self.setMinimumSize(400, 120)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setMouseTracking(True)
+        self.empty_color = empty_color
+        self.year = datetime.date.today().year
+        self.sums = {}
+        self.max_spending = self.max_income = 0
+
+    def setSums(self, year, sums):
+        """
+        Replaces the days of the calendar and redraws it.
+        :param sums: dictionary of Decimal sums by date
+        """
+        self.year = year
+        self.sums = sums
+        self.max_spending = -min(list(sums.values()) + [0])
+        self.max_income = max(list(sums.values()) + [0])
+        self.update()
+
+    def _first_day(self):
+        return datetime.date(self.year, 1, 1)
+
+    def _cell(self):
+        size = self.size()
+        return max(min((size.width() - self.LEFT) // 54,
+                       (size.height() - self.TOP) // 7), 2)
+
+    def _position(self, day):
+        """
+        Returns the column of week and the row of week day of the date.
+        """
+        first_day = self._first_day()
+        offset = (day - first_day).days + first_day.weekday()
+        return offset // 7, day.weekday()
+
+    def _color(self, total):
+        if total is None:
+            return self.empty_color
+        if total < 0:
+            ratio = float(-total / self.max_spending)
+            return QColor(255, int(230 * (1 - ratio)), int(230 * (1 - ratio)))
+        ratio = float(total / self.max_income) if self.max_income else 0
+        return QColor(int(200 * (1 - ratio)), 230, int(200 * (1 - ratio)))
+
+    def paintEvent(self, e):
+
+        qp = QPainter()
+        qp.begin(self)
+        self.drawWidget(qp)
+        qp.end()
+
+    def drawWidget(self, qp):
+        cell = self._cell()
+
+        # Color the days
+        qp.setPen(Qt.white)
+        day = self._first_day()
+        while day.year == self.year:
+            column, row = self._position(day)
+            qp.setBrush(self._color(self.sums.get(day)))
+            qp.drawRect(self.LEFT + column * cell, self.TOP + row * cell,
+                        cell, cell)
+            day += datetime.timedelta(days=1)
+
+        # Print the names of months and days of week
+        qp.setPen(Qt.black)
+        font = QFont('Serif', 7, QFont.Light)
+        qp.setFont(font)
+        for month in range(1, 13):
+            column, _ = self._position(datetime.date(self.year, month, 1))
+            qp.drawText(self.LEFT + column * cell, self.TOP - 4,
+                        MONTHS[month][:3])
+        for row in (0, 2, 4):
+            qp.drawText(2, self.TOP + row * cell + cell - 2, DAYS[row][:3])
+
+    def dayAt(self, pos):
+        """
+        Returns the date under the point of widget or None.
+        """
+        cell = self._cell()
+        column = (pos.x() - self.LEFT) // cell
+        row = (pos.y() - self.TOP) // cell
+        if pos.x() < self.LEFT or pos.y() < self.TOP or row > 6:
+            return None
+        first_day = self._first_day()
+        offset = column * 7 + row - first_day.weekday()
+        day = first_day + datetime.timedelta(days=offset)
+        return day if day.year == self.year else None
+
+    def mouseMoveEvent(self, event):
+        day = self.dayAt(event.pos())
+        if day is None:
+            QToolTip.hideText()
+        else:
+            QToolTip.showText(event.globalPos(), '{}: {}'.format(
+                day, self.sums.get(day, 0)), self)
+
+    def mousePressEvent(self, event):
+        day = self.dayAt(event.pos())
+        if day is not None:
+            self.daySelected.emit(day)
@@ -0,0 +1,104 @@
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+from PyQt5.QtCore import Qt, QPointF
+from PyQt5.QtGui import QPainter, QFont, QPen, QPolygonF
+import numpy as np
+
+from core.analytics import lttb
+from core.helpers import from_cents
+
+
+class QLineChart(QWidget):
+    """
+    Custom QWidget that draws lines of cents over days. Every line is
+    downsampled to the width of the chart before it is drawn, so the cost
+    of painting does not depend on the length of the series.
+    """
+
+    # Space for axis labels, pixels
+    LEFT = 80
+    BOTTOM = 20
+    MARGIN = 8
+
+    def __init__(self):
+        super().__init__()
+
+        self.setMinimumSize(200, 150)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.lines = []
+        # Downsampled lines by plot width
+        self.points = {}
+
+    def setLines(self, lines):
+        """
+        Replaces the lines and redraws the chart.
+        :param lines: list of (days, values, color), days are datetime64[D]
+        """
+        self.lines = [(days.astype(np.int64), values, color)
+                      for days, values, color in lines if len(days)]
+        self.points = {}
+        self.update()
+
+    def downsampled(self, width):
+        """
+        Returns the lines downsampled to a point per pixel of the width.
+        """
+        if width not in self.points:
+            self.points = {width: [lttb(days, values, width) + (color, )
+                                   for days, values, color in self.lines]}
+        return self.points[width]
+
+    def paintEvent(self, e):
+
+        qp = QPainter()
+        qp.begin(self)
+        self.drawWidget(qp)
+        qp.end()
+
+    def drawWidget(self, qp):
+        # Calculate the size of plot area
+        size = self.size()
+        left, top = self.LEFT, self.MARGIN
+        width = size.width() - left - self.MARGIN
+        height = size.height() - top - self.BOTTOM
+        if not self.lines or width < 2 or height < 2:
+            return
+
+        min_x = min(days[0] for days, _, _ in self.lines)
+        max_x = max(days[-1] for days, _, _ in self.lines)
+        min_y = min(int(values.min()) for _, values, _ in self.lines)
+        max_y = max(int(values.max()) for _, values, _ in self.lines)
+        span_x = max(max_x - min_x, 1)
+        span_y = max(max_y - min_y, 1)
+
+        def to_point(x, y):
+            return QPointF(left + (x - min_x) * width / span_x,
+                           top + (max_y - y) * height / span_y)
+
+        # Draw axes and zero line
+        qp.setRenderHint(QPainter.Antialiasing, False)
+        qp.setPen(QPen(Qt.black, 1, Qt.SolidLine))
+        qp.drawLine(left, top, left, top + height)
+        qp.drawLine(left, top + height, left + width, top + height)
+        if min_y < 0 < max_y:
+            qp.setPen(QPen(Qt.gray, 1, Qt.DashLine))
+            zero = to_point(min_x, 0)
+            qp.drawLine(zero, to_point(max_x, 0))
+
+        # Draw the lines
+        qp.setRenderHint(QPainter.Antialiasing, True)
+        for days, values, color in self.downsampled(width):
+            qp.setPen(QPen(color, 1, Qt.SolidLine))
+            qp.drawPolyline(QPolygonF(
+                [to_point(x, y) for x, y in zip(days.tolist(),
+                                                values.tolist())]))
+
+        # Print the ranges of axes
+        qp.setPen(Qt.black)
+        font = QFont('Serif', 7, QFont.Light)
+        qp.setFont(font)
+        qp.drawText(2, top + 10, "{0:.2f}".format(from_cents(max_y)))
+        qp.drawText(2, top + height, "{0:.2f}".format(from_cents(min_y)))
+        bottom = top + height + self.BOTTOM - 4
+        qp.drawText(left, bottom, str(np.datetime64(int(min_x), 'D')))
+        qp.drawText(left + width - 60, bottom,
+                    str(np.datetime64(int(max_x), 'D')))
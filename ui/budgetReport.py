@@ -18,6 +18,12 @@ class Ui_Dialog(object):
         self.horizontalLayout.setObjectName("horizontalLayout")
         spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
         self.horizontalLayout.addItem(spacerItem)
+        self.label_3 = QtWidgets.QLabel(Dialog)
+        self.label_3.setObjectName("label_3")
+        self.horizontalLayout.addWidget(self.label_3)
+        self.periodBox = QtWidgets.QComboBox(Dialog)
+        self.periodBox.setObjectName("periodBox")
+        self.horizontalLayout.addWidget(self.periodBox)
         self.label = QtWidgets.QLabel(Dialog)
         self.label.setObjectName("label")
         self.horizontalLayout.addWidget(self.label)
@@ -30,6 +36,20 @@ class Ui_Dialog(object):
         self.yearBox = QtWidgets.QComboBox(Dialog)
         self.yearBox.setObjectName("yearBox")
         self.horizontalLayout.addWidget(self.yearBox)
+        self.label_4 = QtWidgets.QLabel(Dialog)
+        self.label_4.setObjectName("label_4")
+        self.horizontalLayout.addWidget(self.label_4)
+        self.fromDate = QtWidgets.QDateEdit(Dialog)
+        self.fromDate.setCalendarPopup(True)
+        self.fromDate.setObjectName("fromDate")
+        self.horizontalLayout.addWidget(self.fromDate)
+        self.label_5 = QtWidgets.QLabel(Dialog)
+        self.label_5.setObjectName("label_5")
+        self.horizontalLayout.addWidget(self.label_5)
+        self.toDate = QtWidgets.QDateEdit(Dialog)
+        self.toDate.setCalendarPopup(True)
+        self.toDate.setObjectName("toDate")
+        self.horizontalLayout.addWidget(self.toDate)
         spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
         self.horizontalLayout.addItem(spacerItem1)
         self.verticalLayout.addLayout(self.horizontalLayout)
@@ -64,6 +84,9 @@ class Ui_Dialog(object):
     def retranslateUi(self, Dialog):
         _translate = QtCore.QCoreApplication.translate
         Dialog.setWindowTitle(_translate("Dialog", "Budget Report"))
+        self.label_3.setText(_translate("Dialog", "Period"))
         self.label.setText(_translate("Dialog", "Month"))
         self.label_2.setText(_translate("Dialog", "Year"))
+        self.label_4.setText(_translate("Dialog", "From"))
+        self.label_5.setText(_translate("Dialog", "To"))
 
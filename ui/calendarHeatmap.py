@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'calendarHeatmap.ui'
+#
+# Created by: PyQt5 UI code generator 5.4.1
+#
+# WARNING! All changes made in this file will be lost!
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.resize(900, 260)
+        self.verticalLayout = QtWidgets.QVBoxLayout(Dialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem)
+        self.label = QtWidgets.QLabel(Dialog)
+        self.label.setObjectName("label")
+        self.horizontalLayout.addWidget(self.label)
+        self.yearBox = QtWidgets.QComboBox(Dialog)
+        self.yearBox.setObjectName("yearBox")
+        self.horizontalLayout.addWidget(self.yearBox)
+        self.label_2 = QtWidgets.QLabel(Dialog)
+        self.label_2.setObjectName("label_2")
+        self.horizontalLayout.addWidget(self.label_2)
+        self.categoryBox = QtWidgets.QComboBox(Dialog)
+        self.categoryBox.setObjectName("categoryBox")
+        self.horizontalLayout.addWidget(self.categoryBox)
+        self.label_3 = QtWidgets.QLabel(Dialog)
+        self.label_3.setObjectName("label_3")
+        self.horizontalLayout.addWidget(self.label_3)
+        self.accountBox = QtWidgets.QComboBox(Dialog)
+        self.accountBox.setObjectName("accountBox")
+        self.horizontalLayout.addWidget(self.accountBox)
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem1)
+        self.verticalLayout.addLayout(self.horizontalLayout)
+        self.heatmapLayout = QtWidgets.QVBoxLayout()
+        self.heatmapLayout.setObjectName("heatmapLayout")
+        self.verticalLayout.addLayout(self.heatmapLayout)
+        self.infoLabel = QtWidgets.QLabel(Dialog)
+        self.infoLabel.setText("")
+        self.infoLabel.setObjectName("infoLabel")
+        self.verticalLayout.addWidget(self.infoLabel)
+
+        self.retranslateUi(Dialog)
+        QtCore.QMetaObject.connectSlotsByName(Dialog)
+
+    def retranslateUi(self, Dialog):
+        _translate = QtCore.QCoreApplication.translate
+        Dialog.setWindowTitle(_translate("Dialog", "Spending Calendar"))
+        self.label.setText(_translate("Dialog", "Year"))
+        self.label_2.setText(_translate("Dialog", "Category"))
+        self.label_3.setText(_translate("Dialog", "Account"))
+
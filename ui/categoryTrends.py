@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'categoryTrends.ui'
+#
+# Created by: PyQt5 UI code generator 5.4.1
+#
+# WARNING! All changes made in this file will be lost!
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.resize(1000, 560)
+        self.verticalLayout = QtWidgets.QVBoxLayout(Dialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem)
+        self.label = QtWidgets.QLabel(Dialog)
+        self.label.setObjectName("label")
+        self.horizontalLayout.addWidget(self.label)
+        self.fromYearBox = QtWidgets.QComboBox(Dialog)
+        self.fromYearBox.setObjectName("fromYearBox")
+        self.horizontalLayout.addWidget(self.fromYearBox)
+        self.label_2 = QtWidgets.QLabel(Dialog)
+        self.label_2.setObjectName("label_2")
+        self.horizontalLayout.addWidget(self.label_2)
+        self.tillYearBox = QtWidgets.QComboBox(Dialog)
+        self.tillYearBox.setObjectName("tillYearBox")
+        self.horizontalLayout.addWidget(self.tillYearBox)
+        self.label_3 = QtWidgets.QLabel(Dialog)
+        self.label_3.setObjectName("label_3")
+        self.horizontalLayout.addWidget(self.label_3)
+        self.groupBox = QtWidgets.QComboBox(Dialog)
+        self.groupBox.setObjectName("groupBox")
+        self.horizontalLayout.addWidget(self.groupBox)
+        self.label_4 = QtWidgets.QLabel(Dialog)
+        self.label_4.setObjectName("label_4")
+        self.horizontalLayout.addWidget(self.label_4)
+        self.kindBox = QtWidgets.QComboBox(Dialog)
+        self.kindBox.setObjectName("kindBox")
+        self.horizontalLayout.addWidget(self.kindBox)
+        self.label_5 = QtWidgets.QLabel(Dialog)
+        self.label_5.setObjectName("label_5")
+        self.horizontalLayout.addWidget(self.label_5)
+        self.windowBox = QtWidgets.QSpinBox(Dialog)
+        self.windowBox.setMinimum(1)
+        self.windowBox.setMaximum(24)
+        self.windowBox.setProperty("value", 3)
+        self.windowBox.setObjectName("windowBox")
+        self.horizontalLayout.addWidget(self.windowBox)
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem1)
+        self.verticalLayout.addLayout(self.horizontalLayout)
+        self.trendsView = QtWidgets.QTableView(Dialog)
+        self.trendsView.setObjectName("trendsView")
+        self.verticalLayout.addWidget(self.trendsView)
+
+        self.retranslateUi(Dialog)
+        QtCore.QMetaObject.connectSlotsByName(Dialog)
+
+    def retranslateUi(self, Dialog):
+        _translate = QtCore.QCoreApplication.translate
+        Dialog.setWindowTitle(_translate("Dialog", "Category Trends"))
+        self.label.setText(_translate("Dialog", "From"))
+        self.label_2.setText(_translate("Dialog", "Till"))
+        self.label_3.setText(_translate("Dialog", "Group by"))
+        self.label_4.setText(_translate("Dialog", "Show"))
+        self.label_5.setText(_translate("Dialog", "Months to average"))
+
@@ -0,0 +1,203 @@
+""" Assorted GUI helpers. """
+from PyQt5.Qt import QMessageBox, QDate, QApplication, QEvent, QObject,\
+    QTimer, QLabel, QStatusBar, QDialog, QBoxLayout
+import time
+from core.enums import MONTHS, PERIODS
+from core.helpers import _from_preset_to_period
+from core.tracing import span
+
+
+def show_warning(text):
+    """
+    Shows a simple warning with given text.
+    """
+    msg_box = QMessageBox()
+    msg_box.setText(text)
+    msg_box.setStandardButtons(QMessageBox.Ok)
+    msg_box.setDefaultButton(QMessageBox.Ok)
+    msg_box.exec()
+
+
+class PeriodSelector:
+    """
+    Mixin for report dialogs choosing the period by periodBox preset,
+    monthBox and yearBox or by fromDate and toDate for custom range.
+    """
+
+    def setup_period(self, years, period_changed):
+        """
+        Fills the period widgets, period_changed is called with no
+        arguments whenever chosen period changes.
+        """
+        self.period_changed = period_changed
+
+        self.periodBox.addItems(PERIODS)
+        self.yearBox.addItems(years)
+        self.monthBox.addItems(MONTHS)
+        current_date = QDate.currentDate()
+        self.yearBox.setCurrentText(str(current_date.year()))
+        self.monthBox.setCurrentText(MONTHS[current_date.month()])
+        self.show_period()
+
+        self.periodBox.currentTextChanged.connect(self.preset_changed)
+        self.yearBox.currentTextChanged.connect(self.preset_changed)
+        self.monthBox.currentTextChanged.connect(self.preset_changed)
+        self.fromDate.dateChanged.connect(lambda date: self.period_changed())
+        self.toDate.dateChanged.connect(lambda date: self.period_changed())
+
+    def period(self):
+        """
+        Returns starting and ending dates of chosen period.
+        """
+        return self.fromDate.date().toPyDate(), self.toDate.date().toPyDate()
+
+    def show_period(self):
+        """
+        Puts the dates of chosen preset into date edits, they are editable
+        for custom range only.
+        """
+        preset = self.periodBox.currentText()
+        custom = preset == 'Custom'
+        self.fromDate.setEnabled(custom)
+        self.toDate.setEnabled(custom)
+        self.monthBox.setEnabled(preset == 'Month')
+        self.yearBox.setEnabled(preset == 'Month' or
+                                preset.startswith('Quarter'))
+        if custom:
+            return
+
+        from_date, till_date = _from_preset_to_period(
+            preset, self.monthBox.currentIndex(),  # by position
+            int(self.yearBox.currentText()),
+            QDate.currentDate().toPyDate())
+        # Both dates are set before the period is reported as changed
+        for edit, date in ((self.fromDate, from_date),
+                           (self.toDate, till_date)):
+            edit.blockSignals(True)
+            edit.setDate(date)
+            edit.blockSignals(False)
+
+    def preset_changed(self, _):
+        self.show_period()
+        self.period_changed()
+
+
+class TracedApplication(QApplication):
+    """
+    Application recording spans of layout, paint and other events, where Qt
+    spends the time of widget rebuilds.
+    """
+    EVENTS = {
+        QEvent.Polish: 'Polish',
+        QEvent.Show: 'Show',
+        QEvent.Resize: 'Resize',
+        QEvent.LayoutRequest: 'LayoutRequest',
+        QEvent.UpdateRequest: 'UpdateRequest',
+        QEvent.Paint: 'Paint',
+    }
+
+    def notify(self, receiver, event):
+        name = self.EVENTS.get(event.type())
+        if name is None:
+            return super().notify(receiver, event)
+        with span(name + ' ' + type(receiver).__name__, 'qt'):
+            return super().notify(receiver, event)
+
+
+class PerformanceHud(QObject):
+    """
+    Status bar panel showing wall time, SQL statements, SQL time and rows
+    fetched of the last action: handling of user input till the event loop
+    is idle. The panel is shown in the main window and in every dialog
+    shown while the HUD is on.
+    """
+    ACTION_EVENTS = (QEvent.MouseButtonRelease, QEvent.MouseButtonDblClick,
+                     QEvent.KeyPress)
+    NAME = 'performanceHud'
+
+    def __init__(self, status_bar, stats):
+        """
+        :param stats: callable returning QueryStats of the opened file or
+        None
+        """
+        super().__init__()
+        self.stats = stats
+        self.text = 'No actions yet'
+        # Labels of the panel and status bars added to dialogs
+        self.widgets = []
+        # Start time and stats snapshot of the action in progress
+        self.action = None
+
+        self._add_label(status_bar)
+        QApplication.instance().installEventFilter(self)
+
+    def _add_widget(self, widget):
+        self.widgets.append(widget)
+        widget.destroyed.connect(lambda: self.widgets.remove(widget))
+
+    def _add_label(self, status_bar):
+        label = QLabel(self.text)
+        label.setObjectName(self.NAME)
+        status_bar.addPermanentWidget(label)
+        self._add_widget(label)
+
+    def _add_to_dialog(self, dialog):
+        """
+        Adds status bar with the panel to the bottom of vertical layout of
+        the dialog or to the top of any other.
+        """
+        status_bar = QStatusBar(dialog)
+        status_bar.setObjectName(self.NAME)
+        status_bar.setSizeGripEnabled(False)
+        layout = dialog.layout()
+        if isinstance(layout, QBoxLayout) and\
+                layout.direction() == QBoxLayout.TopToBottom:
+            layout.addWidget(status_bar)
+        else:
+            layout.setMenuBar(status_bar)
+        self._add_widget(status_bar)
+        self._add_label(status_bar)
+
+    def eventFilter(self, obj, event):
+        event_type = event.type()
+        if event_type in self.ACTION_EVENTS and self.action is None:
+            stats = self.stats()
+            self.action = (time.perf_counter(), stats,
+                           stats.snapshot() if stats else None)
+            # Fires when all the events caused by the input are handled,
+            # also in the event loop of the dialog opened by the action
+            QTimer.singleShot(0, self.finish)
+        elif event_type == QEvent.Show and isinstance(obj, QDialog) and\
+                obj.layout() is not None and\
+                obj.findChild(QStatusBar, self.NAME) is None:
+            self._add_to_dialog(obj)
+        return False
+
+    def finish(self):
+        """
+        Shows the usage of the action in all panels.
+        """
+        start, stats, snapshot = self.action
+        self.action = None
+        elapsed = (time.perf_counter() - start) * 1000
+        current = self.stats()
+        if current is None:
+            self.text = '{:.0f} ms'.format(elapsed)
+        else:
+            if current is not stats:  # Other file was opened
+                snapshot = type(current)().snapshot()
+            usage = current.since(snapshot)
+            self.text = '{:.0f} ms | SQL: {} in {:.1f} ms | {} rows'.format(
+                elapsed, usage.statements, usage.time * 1000, usage.rows)
+        for widget in self.widgets:
+            if isinstance(widget, QLabel):
+                widget.setText(self.text)
+
+    def close(self):
+        """
+        Removes the panels and stops following actions.
+        """
+        QApplication.instance().removeEventFilter(self)
+        for widget in list(self.widgets):
+            widget.setParent(None)
+            widget.deleteLater()
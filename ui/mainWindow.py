@@ -90,6 +90,21 @@ class Ui_MainWindow(object):
         self.actionBudgetReport.setObjectName("actionBudgetReport")
         self.actionBalance = QtWidgets.QAction(MainWindow)
         self.actionBalance.setObjectName("actionBalance")
+        self.actionSearch = QtWidgets.QAction(MainWindow)
+        self.actionSearch.setObjectName("actionSearch")
+        self.actionLedger = QtWidgets.QAction(MainWindow)
+        self.actionLedger.setObjectName("actionLedger")
+        self.actionBudgetMatrix = QtWidgets.QAction(MainWindow)
+        self.actionBudgetMatrix.setObjectName("actionBudgetMatrix")
+        self.actionTrends = QtWidgets.QAction(MainWindow)
+        self.actionTrends.setObjectName("actionTrends")
+        self.actionBalanceHistory = QtWidgets.QAction(MainWindow)
+        self.actionBalanceHistory.setObjectName("actionBalanceHistory")
+        self.actionHeatmap = QtWidgets.QAction(MainWindow)
+        self.actionHeatmap.setObjectName("actionHeatmap")
+        self.actionPerformanceHud = QtWidgets.QAction(MainWindow)
+        self.actionPerformanceHud.setCheckable(True)
+        self.actionPerformanceHud.setObjectName("actionPerformanceHud")
         self.menuFile.addAction(self.actionNewFile)
         self.menuFile.addAction(self.actionOpenFile)
         self.menuFile.addAction(self.actionCloseFile)
@@ -100,7 +115,14 @@ class Ui_MainWindow(object):
         self.menuManage.addAction(self.actionBudget)
         self.menuReports.addAction(self.actionBudgetReport)
         self.menuReports.addAction(self.actionBalance)
+        self.menuReports.addAction(self.actionSearch)
+        self.menuReports.addAction(self.actionLedger)
+        self.menuReports.addAction(self.actionBudgetMatrix)
+        self.menuReports.addAction(self.actionTrends)
+        self.menuReports.addAction(self.actionBalanceHistory)
+        self.menuReports.addAction(self.actionHeatmap)
         self.menuHelp.addAction(self.actionAbout)
+        self.menuHelp.addAction(self.actionPerformanceHud)
         self.menuBar.addAction(self.menuFile.menuAction())
         self.menuBar.addAction(self.menuManage.menuAction())
         self.menuBar.addAction(self.menuReports.menuAction())
@@ -134,5 +156,13 @@ class Ui_MainWindow(object):
         self.actionAbout.setText(_translate("MainWindow", "About"))
         self.actionBudgetReport.setText(_translate("MainWindow", "Budget"))
         self.actionBalance.setText(_translate("MainWindow", "Balance"))
+        self.actionSearch.setText(_translate("MainWindow", "Search transactions"))
+        self.actionSearch.setShortcut(_translate("MainWindow", "Ctrl+F"))
+        self.actionLedger.setText(_translate("MainWindow", "All transactions"))
+        self.actionBudgetMatrix.setText(_translate("MainWindow", "Budget matrix"))
+        self.actionTrends.setText(_translate("MainWindow", "Category trends"))
+        self.actionBalanceHistory.setText(_translate("MainWindow", "Balance history"))
+        self.actionHeatmap.setText(_translate("MainWindow", "Spending calendar"))
+        self.actionPerformanceHud.setText(_translate("MainWindow", "Performance HUD"))
 
 import ui.iconset_rc
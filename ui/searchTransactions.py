@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'searchTransactions.ui'
+#
+# Created by: PyQt5 UI code generator 5.4.1
+#
+# WARNING! All changes made in this file will be lost!
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.resize(700, 454)
+        self.verticalLayout = QtWidgets.QVBoxLayout(Dialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.label = QtWidgets.QLabel(Dialog)
+        self.label.setObjectName("label")
+        self.horizontalLayout.addWidget(self.label)
+        self.searchEdit = QtWidgets.QLineEdit(Dialog)
+        self.searchEdit.setObjectName("searchEdit")
+        self.horizontalLayout.addWidget(self.searchEdit)
+        self.verticalLayout.addLayout(self.horizontalLayout)
+        self.resultsView = QtWidgets.QTableView(Dialog)
+        self.resultsView.setObjectName("resultsView")
+        self.verticalLayout.addWidget(self.resultsView)
+        self.statusLabel = QtWidgets.QLabel(Dialog)
+        self.statusLabel.setText("")
+        self.statusLabel.setObjectName("statusLabel")
+        self.verticalLayout.addWidget(self.statusLabel)
+
+        self.retranslateUi(Dialog)
+        QtCore.QMetaObject.connectSlotsByName(Dialog)
+
+    def retranslateUi(self, Dialog):
+        _translate = QtCore.QCoreApplication.translate
+        Dialog.setWindowTitle(_translate("Dialog", "Search Transactions"))
+        self.label.setText(_translate("Dialog", "Find"))
+
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'transactionsLedger.ui'
+#
+# Created by: PyQt5 UI code generator 5.4.1
+#
+# WARNING! All changes made in this file will be lost!
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.resize(800, 560)
+        self.verticalLayout = QtWidgets.QVBoxLayout(Dialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.rangeBox = QtWidgets.QCheckBox(Dialog)
+        self.rangeBox.setObjectName("rangeBox")
+        self.horizontalLayout.addWidget(self.rangeBox)
+        self.fromDate = QtWidgets.QDateEdit(Dialog)
+        self.fromDate.setEnabled(False)
+        self.fromDate.setCalendarPopup(True)
+        self.fromDate.setObjectName("fromDate")
+        self.horizontalLayout.addWidget(self.fromDate)
+        self.label = QtWidgets.QLabel(Dialog)
+        self.label.setObjectName("label")
+        self.horizontalLayout.addWidget(self.label)
+        self.toDate = QtWidgets.QDateEdit(Dialog)
+        self.toDate.setEnabled(False)
+        self.toDate.setCalendarPopup(True)
+        self.toDate.setObjectName("toDate")
+        self.horizontalLayout.addWidget(self.toDate)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem)
+        self.exBudgetBox = QtWidgets.QCheckBox(Dialog)
+        self.exBudgetBox.setChecked(True)
+        self.exBudgetBox.setObjectName("exBudgetBox")
+        self.horizontalLayout.addWidget(self.exBudgetBox)
+        self.closedBox = QtWidgets.QCheckBox(Dialog)
+        self.closedBox.setChecked(True)
+        self.closedBox.setObjectName("closedBox")
+        self.horizontalLayout.addWidget(self.closedBox)
+        self.verticalLayout.addLayout(self.horizontalLayout)
+        self.ledgerView = QtWidgets.QTableView(Dialog)
+        self.ledgerView.setSortingEnabled(True)
+        self.ledgerView.setObjectName("ledgerView")
+        self.verticalLayout.addWidget(self.ledgerView)
+        self.countLabel = QtWidgets.QLabel(Dialog)
+        self.countLabel.setText("")
+        self.countLabel.setObjectName("countLabel")
+        self.verticalLayout.addWidget(self.countLabel)
+
+        self.retranslateUi(Dialog)
+        self.rangeBox.toggled['bool'].connect(self.fromDate.setEnabled)
+        self.rangeBox.toggled['bool'].connect(self.toDate.setEnabled)
+        QtCore.QMetaObject.connectSlotsByName(Dialog)
+
+    def retranslateUi(self, Dialog):
+        _translate = QtCore.QCoreApplication.translate
+        Dialog.setWindowTitle(_translate("Dialog", "All Transactions"))
+        self.rangeBox.setText(_translate("Dialog", "From"))
+        self.label.setText(_translate("Dialog", "To"))
+        self.exBudgetBox.setText(_translate("Dialog", "Off-budget accounts"))
+        self.closedBox.setText(_translate("Dialog", "Closed accounts"))
+